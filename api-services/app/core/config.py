@@ -26,6 +26,8 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(..., alias="DATABASE_URL")
+    db_pool_size: int = Field(default=25, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=0, alias="DB_MAX_OVERFLOW")
 
     # CORS
     cors_origins: List[str] = Field(
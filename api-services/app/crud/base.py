@@ -1,13 +1,37 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
 from app.models.base import BaseModel as Base
 from pydantic import BaseModel
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Tuple
+from sqlalchemy import Select, exists, insert, inspect, select, tuple_, update
+from sqlalchemy.orm import InstanceState, Session
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def encode_cursor(obj: Base) -> str:
+    """Encode the (created_at, id) position of a record as an opaque cursor."""
+    raw = json.dumps({"ts": obj.created_at.isoformat(), "id": str(obj.id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    :raises ValueError: If the cursor is malformed
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["ts"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Generic CRUD operations for a given SQLAlchemy model."""
 
@@ -20,23 +44,83 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        """Retrieve a single record by its ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+        """
+        Retrieve a single record by its ID.
+
+        Uses the identity map first: no SELECT if the record is already loaded.
+        """
+        return db.get(self.model, id)
+
+    def exists_by(self, db: Session, **filters: Any) -> bool:
+        """
+        Check whether a record matches the given column values.
+
+        Runs SELECT EXISTS(...) instead of loading and materializing the row.
+        """
+        conditions = [
+            getattr(self.model, key) == value for key, value in filters.items()
+        ]
+        return bool(db.scalar(select(exists().where(*conditions))))
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """Retrieve multiple records with pagination."""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        stmt = select(self.model).offset(skip).limit(limit)
+        return list(db.scalars(stmt))
+
+    def get_multi_has_more(
+        self, db: Session, *, skip: int = 0, limit: int = 100
+    ) -> Tuple[List[ModelType], bool]:
+        """
+        Retrieve multiple records with pagination and a "has more" flag.
+
+        Fetches one extra row instead of running a separate COUNT(*) query.
+        """
+        stmt = select(self.model).offset(skip).limit(limit + 1)
+        rows = list(db.scalars(stmt))
+        return rows[:limit], len(rows) > limit
+
+    def get_multi_keyset(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Retrieve multiple records with keyset pagination.
+
+        Records are ordered by (created_at, id). Returns the page and the cursor
+        of the next page, or None when there are no more records.
+        """
+        return self._keyset_page(db, select(self.model), cursor=cursor, limit=limit)
+
+    def _keyset_page(
+        self, db: Session, stmt: Select, *, cursor: Optional[str], limit: int
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Apply keyset pagination on (created_at, id) to the given statement."""
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(self.model.created_at, self.model.id) > (created_at, last_id)
+            )
+
+        # Fetch one extra row to know whether a next page exists
+        stmt = stmt.order_by(self.model.created_at, self.model.id).limit(limit + 1)
+        rows = list(db.scalars(stmt))
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        """Create a new record."""
+        """Create a new record with a single INSERT ... RETURNING."""
         obj_in_data = obj_in.model_dump()
-        db_obj = self.model(**obj_in_data)  # type: ignore
+        stmt = insert(self.model).values(**obj_in_data).returning(self.model)
 
-        db.add(db_obj)
+        # SAVEPOINT: an IntegrityError only rolls back this insert and
+        # leaves the surrounding transaction usable
+        with db.begin_nested():
+            db_obj = db.scalars(stmt).one()
         db.commit()
-        db.refresh(db_obj)
 
         return db_obj
 
@@ -45,26 +129,50 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db: Session,
         *,
         db_obj: ModelType,
-        obj_in: UpdateSchemaType | Dict[str, Any]
+        obj_in: UpdateSchemaType | Dict[str, Any],
     ) -> ModelType:
-        """Update an existing record."""
+        """Update an existing record with a single UPDATE ... RETURNING."""
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-
-        for field in update_data:
-            setattr(db_obj, field, update_data[field])
-
-        db.add(db_obj)
+            # Only the explicitly set fields, without dumping the whole model
+            update_data = {
+                field: getattr(obj_in, field) for field in obj_in.model_fields_set
+            }
+
+        if not update_data:
+            return db_obj
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**update_data)
+            .returning(self.model)
+        )
+        db_obj = db.scalars(stmt).one()
+
+        # RETURNING only refreshes columns: expire loaded relationships so they
+        # follow the new foreign keys on next access
+        state: InstanceState[ModelType] = inspect(db_obj)
+        loaded = [
+            rel.key
+            for rel in state.mapper.relationships
+            if rel.key not in state.unloaded
+        ]
+        if loaded:
+            db.expire(db_obj, loaded)
         db.commit()
-        db.refresh(db_obj)
 
         return db_obj
 
     def delete(self, db: Session, *, id: Any) -> Optional[ModelType]:
-        """Delete a record by its ID."""
-        obj = db.query(self.model).filter(self.model.id == id).first()
+        """
+        Delete a record by its ID.
+
+        Goes through the unit of work (not a bulk DELETE) so relationships are
+        handled, e.g. products of a deleted collection get collection_id = NULL.
+        """
+        obj = db.get(self.model, id)
 
         if obj:
             db.delete(obj)
@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
 from app.crud.base import CRUDBase
-from app.models.product import Product
+from app.models.product import Product, ProductCategory, ProductCollection
 from app.schemas.product import ProductCreate, ProductUpdate
 
 
@@ -17,6 +18,26 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         """Retrieve a product by its slug."""
         return db.query(Product).filter(Product.slug == slug).first()
 
+    def get_pages(
+        self, db: Session, *, page_size: int, n_pages: int
+    ) -> Dict[int, List[Product]]:
+        """
+        Retrieve several consecutive pages of products in a single query.
+
+        Products are ordered by (created_at, id). Returns a mapping from page
+        index (0-based) to the products of that page; missing pages are empty.
+        """
+        rows = (
+            db.query(Product)
+            .order_by(Product.created_at, Product.id)
+            .limit(page_size * n_pages)
+            .all()
+        )
+        return {
+            page: rows[page * page_size : (page + 1) * page_size]
+            for page in range(n_pages)
+        }
+
     def get_by_category_id(
         self, db: Session, *, category_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Product]:
@@ -29,6 +50,18 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
             .all()
         )
 
+    def get_by_category_id_keyset(
+        self,
+        db: Session,
+        *,
+        category_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """Retrieve products by category ID with keyset pagination."""
+        stmt = select(Product).where(Product.category_id == category_id)
+        return self._keyset_page(db, stmt, cursor=cursor, limit=limit)
+
     def get_by_collection_id(
         self, db: Session, *, collection_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Product]:
@@ -44,11 +77,16 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     def get_by_category_slug(
         self, db: Session, *, category_slug: str, skip: int = 0, limit: int = 100
     ) -> List[Product]:
-        """Retrieve products by category slug with pagination."""
+        """
+        Retrieve products by category slug with pagination.
+
+        The joined category is loaded into `Product.category` (no lazy load).
+        """
         return (
             db.query(Product)
             .join(Product.category)
-            .filter(Product.category.has(slug=category_slug))
+            .filter(ProductCategory.slug == category_slug)
+            .options(contains_eager(Product.category))
             .offset(skip)
             .limit(limit)
             .all()
@@ -57,11 +95,16 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     def get_by_collection_slug(
         self, db: Session, *, collection_slug: str, skip: int = 0, limit: int = 100
     ) -> List[Product]:
-        """Retrieve products by collection slug with pagination."""
+        """
+        Retrieve products by collection slug with pagination.
+
+        The joined collection is loaded into `Product.collection` (no lazy load).
+        """
         return (
             db.query(Product)
             .join(Product.collection)
-            .filter(Product.collection.has(slug=collection_slug))
+            .filter(ProductCollection.slug == collection_slug)
+            .options(contains_eager(Product.collection))
             .offset(skip)
             .limit(limit)
             .all()
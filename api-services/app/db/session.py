@@ -4,14 +4,25 @@ Gère la connexion SQLAlchemy avec PostgreSQL.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+# Dimensionnement du pool (QueuePool) ; SQLite utilise ses propres pools
+pool_options = {}
+if make_url(settings.database_url).get_backend_name() != "sqlite":
+    pool_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+    }
+
 # Créer l'engine SQLAlchemy
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,  # Vérifie la connexion avant de l'utiliser
     echo=settings.debug,  # Affiche les requêtes SQL en mode debug
+    query_cache_size=1200,  # Cache LRU des requêtes compilées
+    **pool_options,
 )
 
 # Créer la factory de sessions
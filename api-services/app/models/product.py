@@ -1,5 +1,5 @@
 from app.models.base import BaseModel
-from sqlalchemy import Column, String, Text, ForeignKey, UUID
+from sqlalchemy import Column, String, Text, ForeignKey, Index, UUID
 from sqlalchemy.orm import relationship
 
 
@@ -9,6 +9,10 @@ class ProductCategory(BaseModel):
     """
 
     __tablename__ = "product_categories"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_product_categories_created_at_id", "created_at", "id"),
+    )
 
     # Core fields
     name = Column(String(100), nullable=False, unique=True, index=True)
@@ -41,6 +45,13 @@ class Product(BaseModel):
     """
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), globally and per category
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index(
+            "ix_products_category_id_created_at_id", "category_id", "created_at", "id"
+        ),
+    )
 
     # Core fields
     name = Column(String(200), nullable=False, index=True)
@@ -152,8 +152,7 @@ class ProductService:
             ValueError: Si les validations échouent
         """
         # Validation : slug unique
-        existing_product = crud_product.get_by_slug(db=db, slug=product_in.slug)
-        if existing_product:
+        if crud_product.exists_by(db=db, slug=product_in.slug):
             raise ValueError(f"Product with slug '{product_in.slug}' already exists")
 
         # Validation : catégorie existe
@@ -190,8 +189,7 @@ class ProductService:
 
         # Validation : slug unique (si fourni et différent de l'actuel)
         if product_in.slug and product_in.slug != product.slug:
-            existing_product = crud_product.get_by_slug(db=db, slug=product_in.slug)
-            if existing_product:
+            if crud_product.exists_by(db=db, slug=product_in.slug):
                 raise ValueError(
                     f"Product with slug '{product_in.slug}' already exists"
                 )
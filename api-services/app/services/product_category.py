@@ -132,8 +132,7 @@ class ProductCategoryService:
         Raises:
             ValueError: Si le slug existe déjà
         """
-        existing_category = crud_category.get_by_slug(db=db, slug=slug)
-        if existing_category:
+        if crud_category.exists_by(db=db, slug=slug):
             raise ValueError(f"Category with slug '{slug}' already exists")
 
     def _validate_name_uniqueness(self, db: Session, name: str) -> None:
@@ -147,8 +146,7 @@ class ProductCategoryService:
         Raises:
             ValueError: Si le nom existe déjà
         """
-        existing_category = crud_category.get_by_name(db=db, name=name)
-        if existing_category:
+        if crud_category.exists_by(db=db, name=name):
             raise ValueError(f"Category with name '{name}' already exists")
 
 
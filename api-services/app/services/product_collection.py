@@ -134,8 +134,7 @@ class ProductCollectionService:
         Raises:
             ValueError: Si le slug existe déjà
         """
-        existing_collection = crud_collection.get_by_slug(db=db, slug=slug)
-        if existing_collection:
+        if crud_collection.exists_by(db=db, slug=slug):
             raise ValueError(f"Collection with slug '{slug}' already exists")
 
     def _validate_name_uniqueness(self, db: Session, name: str) -> None:
@@ -149,8 +148,7 @@ class ProductCollectionService:
         Raises:
             ValueError: Si le nom existe déjà
         """
-        existing_collection = crud_collection.get_by_name(db=db, name=name)
-        if existing_collection:
+        if crud_collection.exists_by(db=db, name=name):
             raise ValueError(f"Collection with name '{name}' already exists")
 
 
@@ -3,11 +3,18 @@ Configuration globale pour pytest.
 Fixtures partagées pour tous les tests.
 """
 
+import base64
+import hashlib
+import hmac
 import os
+import time
+import httpx
+import orjson
 import pytest
-from datetime import datetime, timedelta
-from jose import jwt
+import pytest_asyncio
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 # Charger les variables d'environnement de test AVANT d'importer l'app
@@ -23,10 +30,11 @@ from app.api.deps import get_current_user  # noqa: E402
 
 # Import du module de base de données de test
 from tests.fixtures.database import (  # noqa: E402
+    TestingSessionLocal,
     create_test_database,
     drop_test_database,
-    get_test_db,
-    reset_test_database,
+    test_engine,
+    truncate_all,
 )
 
 # Import des factories
@@ -37,6 +45,63 @@ from tests.fixtures.factories import (  # noqa: E402
 )
 
 
+@contextmanager
+def _override(app, mapping):
+    """
+    Installe temporairement des overrides de dépendances FastAPI.
+
+    Seules les clés de `mapping` sont restaurées à la sortie : les overrides
+    posés par d'autres fixtures restent intacts (contrairement à
+    `app.dependency_overrides.clear()`).
+
+    Args:
+        app: Application FastAPI
+        mapping: Dictionnaire {dépendance: override}
+    """
+    prev = {key: app.dependency_overrides.get(key) for key in mapping}
+    app.dependency_overrides.update(mapping)
+    try:
+        yield
+    finally:
+        for key, value in prev.items():
+            if value is None:
+                app.dependency_overrides.pop(key, None)
+            else:
+                app.dependency_overrides[key] = value
+
+
+# Horodatage (epoch en secondes) utilisé pour les claims "exp"/"iat" des tokens
+_NOW = int(time.time())
+
+# Header JWT précalculé : base64url('{"alg":"HS256","typ":"JWT"}')
+_JWT_HEADER = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+
+
+def _b64url(data: bytes) -> bytes:
+    """Encode en base64url sans padding (RFC 7515)."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _sign(payload: dict, secret: str) -> str:
+    """
+    Génère un JWT HS256 sans passer par `jose`.
+
+    Les fixtures contrôlent entièrement le payload : pas besoin de la
+    validation des claims ni de la résolution d'algorithme de `jose`.
+    Le chemin de production (decode_token) continue d'utiliser `jose`.
+
+    Args:
+        payload: Claims du token
+        secret: Clé de signature HMAC
+
+    Returns:
+        str: Token JWT signé
+    """
+    body = _JWT_HEADER + b"." + _b64url(orjson.dumps(payload))
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+    return (body + b"." + _b64url(signature)).decode()
+
+
 # ============================================================================
 # FIXTURES DE BASE DE DONNÉES
 # ============================================================================
@@ -59,7 +124,9 @@ def setup_test_database():
 def db() -> Session:
     """
     Fixture pour obtenir une session de base de données de test.
-    Réinitialise la base de données avant chaque test pour garantir l'isolation.
+    Chaque test s'exécute dans une transaction externe annulée à la fin :
+    les commits du code testé ne libèrent que des SAVEPOINTs, et le schéma
+    créé une seule fois par session n'est jamais recréé.
 
     Usage:
         def test_create_product(db):
@@ -71,22 +138,92 @@ def db() -> Session:
     Returns:
         Session: Session de base de données de test propre et isolée
     """
-    # Réinitialiser la DB avant chaque test
-    reset_test_database()
+    # Transaction externe sur la connexion partagée (StaticPool)
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    db_session = TestingSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
+    yield db_session
+
+    # Annuler tout ce que le test a écrit
+    db_session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="class")
+def db_class() -> Session:
+    """
+    Fixture pour une session partagée par tous les tests d'une classe.
+    Les données créées avec cette session sont réellement commitées :
+    elles restent visibles dans les transactions de test (fixture `db`)
+    et sont supprimées à la fin de la classe.
+
+    Usage:
+        @pytest.fixture(scope="class")
+        def shared_row(db_class):
+            row = ProductCategoryFactory.create(db=db_class)
+            db_class.expunge_all()  # Détacher : db.merge(row, load=False) en test
+            return row
 
-    # Créer une nouvelle session
-    db_session = next(get_test_db())
+    Returns:
+        Session: Session de base de données de portée classe
+    """
+    db_session = TestingSessionLocal()
     yield db_session
 
-    # Nettoyer après le test
+    # Supprimer les données partagées de la classe
+    truncate_all(db_session)
     db_session.close()
 
 
+@pytest.fixture(scope="class")
+def shared_category(db_class: Session):
+    """
+    Fixture pour une catégorie créée une seule fois par classe de test.
+    À n'utiliser qu'en lecture (ex: `shared_category.id`).
+
+    Returns:
+        ProductCategory: Catégorie commune aux tests de la classe
+    """
+    category = ProductCategoryFactory.create(db=db_class)
+    db_class.expunge(category)
+    return category
+
+
+@pytest.fixture
+def no_lazy_load(db: Session):
+    """
+    Fixture qui fait échouer le test dès qu'un lazy load émet une requête SQL.
+    Protège les fonctions CRUD contre les régressions N+1.
+
+    Usage:
+        def test_something(db, no_lazy_load):
+            products = crud_product.get_by_category_slug(db=db, ...)
+            assert all(p.category.slug == "x" for p in products)
+
+    Args:
+        db: Session de base de données de test
+    """
+
+    def fail_on_lazy_load(orm_execute_state):
+        if (
+            orm_execute_state.is_select
+            and orm_execute_state.lazy_loaded_from is not None
+        ):
+            raise AssertionError(f"Lazy load detected: {orm_execute_state.statement}")
+
+    event.listen(db, "do_orm_execute", fail_on_lazy_load)
+    yield
+    event.remove(db, "do_orm_execute", fail_on_lazy_load)
+
+
 @pytest.fixture
 def client(db: Session, test_user):
     """
     Fixture pour le client de test FastAPI avec base de données de test.
-    Remplace automatiquement la dépendance get_db par get_test_db
+    Remplace automatiquement la dépendance get_db par la session `db` du test
     et mock l'authentification pour contourner get_current_user.
 
     Usage:
@@ -102,7 +239,7 @@ def client(db: Session, test_user):
         TestClient: Client de test configuré avec la DB de test et auth mockée
     """
 
-    # Remplacer la dépendance get_db par get_test_db
+    # Remplacer la dépendance get_db par la session du test
     def override_get_db():
         try:
             yield db
@@ -113,49 +250,63 @@ def client(db: Session, test_user):
     async def override_get_current_user():
         return test_user
 
-    app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_current_user] = override_get_current_user
-
-    yield TestClient(app)
+    with _override(
+        app,
+        {
+            get_db: override_get_db,
+            get_current_user: override_get_current_user,
+        },
+    ):
+        yield TestClient(app)
 
-    # Nettoyer les overrides après le test
-    app.dependency_overrides.clear()
 
-
-@pytest.fixture
-def client_no_auth(db: Session):
+@pytest.fixture(scope="session")
+def client_no_auth_nodb():
     """
-    Fixture pour le client de test FastAPI SANS mock d'authentification.
-    Utilisé pour tester la vraie logique d'authentification JWT.
+    Fixture pour le client de test FastAPI SANS mock d'authentification
+    et SANS base de données, partagée par toute la session de test.
+    Réservé aux routes sans état : routes principales (/, /health, /docs,
+    openapi.json) et routes qui ne font que de l'authentification
+    (/auth/optional, /auth/protected, /auth/me).
 
     Usage:
-        def test_auth(client_no_auth):
-            response = client_no_auth.get("/api/v1/auth/protected")
+        def test_auth(client_no_auth_nodb):
+            response = client_no_auth_nodb.get("/api/v1/auth/protected")
             assert response.status_code == 403  # Sans token
 
-    Args:
-        db: Session de base de données de test (injection automatique)
-
     Returns:
-        TestClient: Client de test configuré avec la DB de test mais SANS auth mockée
+        TestClient: Client de test sans aucun override de dépendance
     """
+    with TestClient(app) as test_client:
+        yield test_client
 
-    # Remplacer uniquement la dépendance get_db, PAS get_current_user
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
 
-    app.dependency_overrides[get_db] = override_get_db
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """
+    Fixture pour un client HTTP asynchrone partagé sur toute la session.
+    Utilise httpx.AsyncClient avec ASGITransport : les requêtes sont envoyées
+    directement à l'application ASGI sur une boucle d'événements persistante.
 
-    yield TestClient(app)
+    Aucune dépendance n'est remplacée : à réserver aux routes qui
+    n'accèdent pas à la base de données (ex: authentification).
 
-    # Nettoyer les overrides après le test
-    app.dependency_overrides.clear()
+    Usage:
+        pytestmark = pytest.mark.asyncio(loop_scope="session")
 
+        async def test_auth(aclient):
+            response = await aclient.get("/api/v1/auth/protected")
+            assert response.status_code == 403
 
-@pytest.fixture
+    Returns:
+        httpx.AsyncClient: Client asynchrone branché sur l'application
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
 def test_user():
     """
     Fixture pour un utilisateur de test.
@@ -170,7 +321,7 @@ def test_user():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def admin_user():
     """
     Fixture pour un utilisateur administrateur de test.
@@ -185,7 +336,7 @@ def admin_user():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_jwt_token(test_user):
     """
     Génère un JWT valide pour les tests.
@@ -204,13 +355,13 @@ def valid_jwt_token(test_user):
         "email": test_user.email,
         "role": test_user.role,
         "aud": "authenticated",
-        "exp": datetime.utcnow() + timedelta(hours=1),
-        "iat": datetime.utcnow(),
+        "exp": _NOW + 3600,
+        "iat": _NOW,
     }
-    return jwt.encode(payload, settings.supabase_jwt_secret, algorithm="HS256")
+    return _sign(payload, settings.supabase_jwt_secret)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def admin_jwt_token(admin_user):
     """
     Génère un JWT valide pour un utilisateur admin.
@@ -226,13 +377,13 @@ def admin_jwt_token(admin_user):
         "email": admin_user.email,
         "role": admin_user.role,
         "aud": "authenticated",
-        "exp": datetime.utcnow() + timedelta(hours=1),
-        "iat": datetime.utcnow(),
+        "exp": _NOW + 3600,
+        "iat": _NOW,
     }
-    return jwt.encode(payload, settings.supabase_jwt_secret, algorithm="HS256")
+    return _sign(payload, settings.supabase_jwt_secret)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expired_jwt_token(test_user):
     """
     Génère un JWT expiré pour tester la validation.
@@ -248,13 +399,13 @@ def expired_jwt_token(test_user):
         "email": test_user.email,
         "role": test_user.role,
         "aud": "authenticated",
-        "exp": datetime.utcnow() - timedelta(hours=1),  # Expiré il y a 1h
-        "iat": datetime.utcnow() - timedelta(hours=2),
+        "exp": _NOW - 3600,  # Expiré il y a 1h
+        "iat": _NOW - 7200,
     }
-    return jwt.encode(payload, settings.supabase_jwt_secret, algorithm="HS256")
+    return _sign(payload, settings.supabase_jwt_secret)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_signature_token(test_user):
     """
     Génère un JWT avec une signature invalide.
@@ -270,13 +421,13 @@ def invalid_signature_token(test_user):
         "email": test_user.email,
         "role": test_user.role,
         "aud": "authenticated",
-        "exp": datetime.utcnow() + timedelta(hours=1),
-        "iat": datetime.utcnow(),
+        "exp": _NOW + 3600,
+        "iat": _NOW,
     }
-    return jwt.encode(payload, "wrong-secret-key", algorithm="HS256")
+    return _sign(payload, "wrong-secret-key")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers(valid_jwt_token):
     """
     Fixture pour les headers d'authentification avec un token JWT valide.
@@ -290,13 +441,61 @@ def auth_headers(valid_jwt_token):
     return {"Authorization": f"Bearer {valid_jwt_token}"}
 
 
+@pytest.fixture(scope="session")
+def admin_headers(admin_jwt_token):
+    """
+    Fixture pour les headers d'authentification avec un token JWT admin.
+
+    Args:
+        admin_jwt_token: Fixture du token JWT admin
+
+    Returns:
+        dict: Headers avec Authorization Bearer
+    """
+    return {"Authorization": f"Bearer {admin_jwt_token}"}
+
+
+@pytest.fixture(scope="session")
+def expired_headers(expired_jwt_token):
+    """
+    Fixture pour les headers d'authentification avec un token JWT expiré.
+
+    Args:
+        expired_jwt_token: Fixture du token JWT expiré
+
+    Returns:
+        dict: Headers avec Authorization Bearer
+    """
+    return {"Authorization": f"Bearer {expired_jwt_token}"}
+
+
+@pytest.fixture(scope="session")
+def invalid_signature_headers(invalid_signature_token):
+    """
+    Fixture pour les headers d'authentification avec une signature invalide.
+
+    Args:
+        invalid_signature_token: Fixture du token JWT mal signé
+
+    Returns:
+        dict: Headers avec Authorization Bearer
+    """
+    return {"Authorization": f"Bearer {invalid_signature_token}"}
+
+
 # ============================================================================
 # FIXTURES DE DONNÉES DE TEST (FACTORIES)
 # ============================================================================
+# Créées une seule fois par classe via `db_class` (données commitées, supprimées
+# en fin de classe) : à n'utiliser qu'en lecture.
+# Les objets retournés sont détachés de `db_class`. Pour les utiliser dans la
+# session du test (relations, factories), les rattacher sans SELECT :
+#     category = db.merge(test_category, load=False)
+#     ProductFactory.create(db=db, category=category)
 
 
-@pytest.fixture
-def test_category(db: Session):
+@pytest.fixture(scope="class")
+def test_category(db_class: Session):
     """
     Fixture pour créer une catégorie de test.
 
@@ -308,16 +507,18 @@ def test_category(db: Session):
     Returns:
         ProductCategory: Catégorie de test avec des valeurs par défaut
     """
-    return ProductCategoryFactory.create(
-        db=db,
+    category = ProductCategoryFactory.create(
+        db=db_class,
         name="Electronics",
         slug="electronics",
         description="Electronic devices and accessories",
     )
+    db_class.expunge_all()
+    return category
 
 
-@pytest.fixture
-def test_collection(db: Session):
+@pytest.fixture(scope="class")
+def test_collection(db_class: Session):
     """
     Fixture pour créer une collection de test.
 
@@ -329,16 +530,18 @@ def test_collection(db: Session):
     Returns:
         ProductCollection: Collection de test avec des valeurs par défaut
     """
-    return ProductCollectionFactory.create(
-        db=db,
+    collection = ProductCollectionFactory.create(
+        db=db_class,
         name="Summer 2024",
         slug="summer-2024",
         description="Summer collection for 2024",
     )
+    db_class.expunge_all()
+    return collection
 
 
-@pytest.fixture
-def test_product(db: Session, test_category):
+@pytest.fixture(scope="class")
+def test_product(db_class: Session, test_category):
     """
     Fixture pour créer un produit de test.
 
@@ -348,22 +551,24 @@ def test_product(db: Session, test_category):
             assert test_product.category_id is not None
 
     Args:
-        db: Session de base de données
+        db_class: Session de portée classe
         test_category: Catégorie de test (injection automatique)
 
     Returns:
         Product: Produit de test avec des valeurs par défaut
     """
-    return ProductFactory.create(
-        db=db,
+    product = ProductFactory.create(
+        db=db_class,
         name="Laptop Dell XPS 13",
         description="High-performance laptop with 13-inch display",
         category=test_category,
     )
+    db_class.expunge_all()
+    return product
 
 
-@pytest.fixture
-def multiple_categories(db: Session):
+@pytest.fixture(scope="class")
+def multiple_categories(db_class: Session):
     """
     Fixture pour créer plusieurs catégories de test.
 
@@ -374,11 +579,13 @@ def multiple_categories(db: Session):
     Returns:
         list[ProductCategory]: Liste de 3 catégories de test
     """
-    return ProductCategoryFactory.create_batch(db=db, count=3)
+    categories = ProductCategoryFactory.create_batch(db=db_class, count=3)
+    db_class.expunge_all()
+    return categories
 
 
-@pytest.fixture
-def multiple_collections(db: Session):
+@pytest.fixture(scope="class")
+def multiple_collections(db_class: Session):
     """
     Fixture pour créer plusieurs collections de test.
 
@@ -389,11 +596,13 @@ def multiple_collections(db: Session):
     Returns:
         list[ProductCollection]: Liste de 3 collections de test
     """
-    return ProductCollectionFactory.create_batch(db=db, count=3)
+    collections = ProductCollectionFactory.create_batch(db=db_class, count=3)
+    db_class.expunge_all()
+    return collections
 
 
-@pytest.fixture
-def multiple_products(db: Session, test_category):
+@pytest.fixture(scope="class")
+def multiple_products(db_class: Session, test_category):
     """
     Fixture pour créer plusieurs produits de test dans la même catégorie.
 
@@ -404,10 +613,12 @@ def multiple_products(db: Session, test_category):
             assert all(p.category_id == category_id for p in multiple_products)
 
     Args:
-        db: Session de base de données
+        db_class: Session de portée classe
         test_category: Catégorie de test commune
 
     Returns:
         list[Product]: Liste de 5 produits de test
     """
-    return ProductFactory.create_batch(db=db, count=5, category=test_category)
+    products = ProductFactory.create_batch(db=db_class, count=5, category=test_category)
+    db_class.expunge_all()
+    return products
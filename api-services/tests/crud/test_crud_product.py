@@ -3,10 +3,13 @@ Tests pour les opérations CRUD de Product.
 Teste la couche d'accès aux données avec relations vers Category et Collection.
 """
 
+import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.crud import product as crud_product
+from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 from tests.fixtures.factories import (
     ProductFactory,
@@ -136,7 +139,37 @@ class TestProductCRUDRead:
 
         first_page_ids = [p.id for p in first_page]
         second_page_ids = [p.id for p in second_page]
-        assert len(set(first_page_ids) & set(second_page_ids)) == 0
+        assert set(first_page_ids).isdisjoint(second_page_ids)
+
+    def test_get_multi_products_with_keyset_pagination(self, db: Session):
+        """Test de pagination par curseur lors de la récupération de produits."""
+        category = ProductCategoryFactory.create(db=db)
+        ProductFactory.create_batch(db=db, count=10, category=category)
+
+        first_page, cursor = crud_product.get_multi_keyset(db=db, limit=5)
+        assert len(first_page) == 5
+        assert cursor is not None
+
+        second_page, cursor = crud_product.get_multi_keyset(
+            db=db, cursor=cursor, limit=5
+        )
+        assert len(second_page) == 5
+        assert cursor is None
+
+        first_page_ids = [p.id for p in first_page]
+        second_page_ids = [p.id for p in second_page]
+        assert set(first_page_ids).isdisjoint(second_page_ids)
+
+    def test_get_pages_in_single_query(self, db: Session):
+        """Test de récupération de plusieurs pages en une seule requête."""
+        category = ProductCategoryFactory.create(db=db)
+        ProductFactory.create_batch(db=db, count=7, category=category)
+
+        pages = crud_product.get_pages(db=db, page_size=3, n_pages=4)
+
+        assert [len(pages[i]) for i in range(4)] == [3, 3, 1, 0]
+        ids = [p.id for page in pages.values() for p in page]
+        assert len(set(ids)) == 7
 
     def test_get_products_by_category_id(self, db: Session):
         """Test de récupération de produits par category_id."""
@@ -149,7 +182,7 @@ class TestProductCRUDRead:
         electronics = crud_product.get_by_category_id(db=db, category_id=category1.id)
 
         assert len(electronics) == 3
-        assert all(p.category_id == category1.id for p in electronics)
+        assert {p.category_id for p in electronics} == {category1.id}
 
     def test_get_products_by_collection_id(self, db: Session):
         """Test de récupération de produits par collection_id."""
@@ -169,9 +202,9 @@ class TestProductCRUDRead:
         )
 
         assert len(summer_products) == 3
-        assert all(p.collection_id == collection1.id for p in summer_products)
+        assert {p.collection_id for p in summer_products} == {collection1.id}
 
-    def test_get_products_by_category_slug(self, db: Session):
+    def test_get_products_by_category_slug(self, db: Session, no_lazy_load):
         """Test de récupération de produits par slug de catégorie."""
         category = ProductCategoryFactory.create(
             db=db, name="Electronics", slug="electronics"
@@ -181,9 +214,9 @@ class TestProductCRUDRead:
         products = crud_product.get_by_category_slug(db=db, category_slug="electronics")
 
         assert len(products) == 4
-        assert all(p.category.slug == "electronics" for p in products)
+        assert {p.category.slug for p in products} == {"electronics"}
 
-    def test_get_products_by_collection_slug(self, db: Session):
+    def test_get_products_by_collection_slug(self, db: Session, no_lazy_load):
         """Test de récupération de produits par slug de collection."""
         category = ProductCategoryFactory.create(db=db)
         collection = ProductCollectionFactory.create(
@@ -198,7 +231,7 @@ class TestProductCRUDRead:
         )
 
         assert len(products) == 3
-        assert all(p.collection.slug == "summer-sale" for p in products)
+        assert {p.collection.slug for p in products} == {"summer-sale"}
 
     def test_get_products_with_pagination_by_category(self, db: Session):
         """Test de pagination lors de la récupération par catégorie."""
@@ -215,99 +248,146 @@ class TestProductCRUDRead:
         assert len(first_page) == 5
         assert len(second_page) == 5
 
-    def test_get_empty_database(self, db: Session):
-        """Test de récupération sur une base vide."""
-        products = crud_product.get_multi(db=db, skip=0, limit=100)
-
-        assert products == []
+    def test_get_products_with_keyset_pagination_by_category(self, db: Session):
+        """Test de pagination par curseur lors de la récupération par catégorie."""
+        category = ProductCategoryFactory.create(db=db)
+        ProductFactory.create_batch(db=db, count=10, category=category)
 
+        first_page, cursor = crud_product.get_by_category_id_keyset(
+            db=db, category_id=category.id, limit=5
+        )
+        second_page, cursor = crud_product.get_by_category_id_keyset(
+            db=db, category_id=category.id, cursor=cursor, limit=5
+        )
 
-class TestProductCRUDUpdate:
-    """Tests pour la mise à jour de produits."""
+        assert len(first_page) == 5
+        assert len(second_page) == 5
+        assert cursor is None
 
-    def test_update_product_name(self, db: Session):
-        """Test de mise à jour du nom d'un produit."""
-        product = ProductFactory.create(db=db, name="Old Name")
+    def test_get_multi_has_more(self, db: Session):
+        """Test du drapeau has_more sans requête COUNT."""
+        category = ProductCategoryFactory.create(db=db)
+        ProductFactory.create_batch(db=db, count=6, category=category)
 
-        product_update = ProductUpdate(name="New Name")
-        updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
-        )
+        first_page, has_more = crud_product.get_multi_has_more(db=db, skip=0, limit=5)
+        assert len(first_page) == 5
+        assert has_more is True
 
-        assert updated_product.id == product.id
-        assert updated_product.name == "New Name"
+        last_page, has_more = crud_product.get_multi_has_more(db=db, skip=5, limit=5)
+        assert len(last_page) == 1
+        assert has_more is False
 
-    def test_update_product_description(self, db: Session):
-        """Test de mise à jour de la description d'un produit."""
-        product = ProductFactory.create(db=db, description="Old description")
+    def test_get_empty_database(self, db: Session):
+        """Test de récupération sur une base vide."""
+        products = crud_product.get_multi(db=db, skip=0, limit=100)
 
-        product_update = ProductUpdate(description="New description")
-        updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
-        )
+        assert products == []
 
-        assert updated_product.description == "New description"
 
-    def test_update_product_category(self, db: Session):
-        """Test de changement de catégorie d'un produit."""
-        category1 = ProductCategoryFactory.create(db=db, name="Category 1")
-        category2 = ProductCategoryFactory.create(db=db, name="Category 2")
-        product = ProductFactory.create(db=db, category=category1)
+_ORIGINAL_PRODUCT = {
+    "name": "Original Name",
+    "description": "Original description",
+    "collection_id": None,
+}
 
-        product_update = ProductUpdate(category_id=category2.id)
-        updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
-        )
 
-        assert updated_product.category_id == category2.id
+@pytest.fixture
+def fresh_product(db: Session, shared_category) -> Product:
+    """
+    Produit dans son état initial, annulé avec la transaction du test.
 
-    def test_update_product_collection(self, db: Session):
-        """Test d'ajout/changement de collection d'un produit."""
-        category = ProductCategoryFactory.create(db=db)
-        collection = ProductCollectionFactory.create(db=db, name="New Collection")
-        product = ProductFactory.create(db=db, category=category, collection=None)
+    Returns:
+        Product: Produit créé avec `_ORIGINAL_PRODUCT` dans `shared_category`
+    """
+    # Rattacher la catégorie partagée à la session du test, sans SELECT
+    category = db.merge(shared_category, load=False)
+    return ProductFactory.create(
+        db=db,
+        name=_ORIGINAL_PRODUCT["name"],
+        description=_ORIGINAL_PRODUCT["description"],
+        category=category,
+        collection=None,
+    )
 
-        product_update = ProductUpdate(collection_id=collection.id)
-        updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
-        )
 
-        assert updated_product.collection_id == collection.id
+class TestProductCRUDUpdate:
+    """Tests pour la mise à jour de produits."""
 
-    def test_update_product_multiple_fields(self, db: Session):
-        """Test de mise à jour de plusieurs champs à la fois."""
-        category = ProductCategoryFactory.create(db=db)
-        new_category = ProductCategoryFactory.create(db=db, name="New Category")
-        product = ProductFactory.create(
-            db=db, name="Old Name", description="Old description", category=category
-        )
+    @pytest.mark.parametrize(
+        "update_kwargs",
+        [
+            pytest.param({"name": "New Name"}, id="name"),
+            pytest.param({"description": "New description"}, id="description"),
+            pytest.param(
+                {"name": "New Name", "description": "New description"},
+                id="multiple_fields",
+            ),
+        ],
+    )
+    def test_update_product_fields(
+        self, db: Session, fresh_product: Product, update_kwargs: dict
+    ):
+        """
+        Test de mise à jour (partielle) d'un produit.
+        Les champs modifiés prennent la nouvelle valeur, les autres sont conservés.
+        """
+        category_id = fresh_product.category_id
 
-        product_update = ProductUpdate(
-            name="New Name", description="New description", category_id=new_category.id
-        )
         updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
+            db=db, db_obj=fresh_product, obj_in=ProductUpdate(**update_kwargs)
         )
 
-        assert updated_product.name == "New Name"
-        assert updated_product.description == "New description"
-        assert updated_product.category_id == new_category.id
+        assert updated_product.category_id == category_id
+        for field, original_value in _ORIGINAL_PRODUCT.items():
+            assert getattr(updated_product, field) == update_kwargs.get(
+                field, original_value
+            )
+
+    def test_update_product_without_fields_returns_unchanged(
+        self, db: Session, fresh_product: Product
+    ):
+        """Test qu'une mise à jour sans champ renvoie le produit sans UPDATE."""
+        statements = []
+
+        def record(orm_execute_state):
+            statements.append(orm_execute_state.statement)
+
+        event.listen(db, "do_orm_execute", record)
+        try:
+            updated_product = crud_product.update(
+                db=db, db_obj=fresh_product, obj_in=ProductUpdate()
+            )
+        finally:
+            event.remove(db, "do_orm_execute", record)
+
+        assert updated_product is fresh_product
+        assert statements == []
+        for field, original_value in _ORIGINAL_PRODUCT.items():
+            assert getattr(updated_product, field) == original_value
+
+    @pytest.mark.parametrize(
+        "field,factory",
+        [
+            pytest.param("category_id", ProductCategoryFactory, id="category"),
+            pytest.param("collection_id", ProductCollectionFactory, id="collection"),
+        ],
+    )
+    def test_update_product_relation(
+        self, db: Session, fresh_product: Product, field: str, factory
+    ):
+        """Test de changement de catégorie ou de collection d'un produit."""
+        related = factory.create(db=db)
 
-    def test_update_product_partial(self, db: Session):
-        """Test de mise à jour partielle."""
-        product = ProductFactory.create(
-            db=db, name="Original Name", description="Original description"
-        )
-        original_category_id = product.category_id
-
-        product_update = ProductUpdate(name="Updated Name")
         updated_product = crud_product.update(
-            db=db, db_obj=product, obj_in=product_update
+            db=db, db_obj=fresh_product, obj_in=ProductUpdate(**{field: related.id})
         )
 
-        assert updated_product.name == "Updated Name"
-        assert updated_product.description == "Original description"
-        assert updated_product.category_id == original_category_id
+        assert getattr(updated_product, field) == related.id
+        # La relation déjà chargée suit la nouvelle clé étrangère
+        assert getattr(updated_product, field.removesuffix("_id")).id == related.id
+        for name, original_value in _ORIGINAL_PRODUCT.items():
+            if name != field:
+                assert getattr(updated_product, name) == original_value
 
 
 class TestProductCRUDDelete:
@@ -357,8 +437,6 @@ class TestProductCRUDRelationships:
         category = ProductCategoryFactory.create(db=db, name="Electronics")
         product = ProductFactory.create(db=db, name="Laptop", category=category)
 
-        db.refresh(product)
-
         assert product.category is not None
         assert product.category.name == "Electronics"
         assert product.category.id == category.id
@@ -371,8 +449,6 @@ class TestProductCRUDRelationships:
             db=db, name="Product", category=category, collection=collection
         )
 
-        db.refresh(product)
-
         assert product.collection is not None
         assert product.collection.name == "Summer Sale"
         assert product.collection.id == collection.id
@@ -381,7 +457,5 @@ class TestProductCRUDRelationships:
         """Test qu'un produit peut exister sans collection."""
         product = ProductFactory.create(db=db, collection=None)
 
-        db.refresh(product)
-
         assert product.collection_id is None
         assert product.collection is None
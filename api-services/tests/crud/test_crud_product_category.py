@@ -3,13 +3,16 @@ Tests pour les opérations CRUD de ProductCategory.
 Teste la couche d'accès aux données sans la logique métier.
 """
 
+import base64
+import json
 import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.crud import product_category as crud_product_category
 from app.schemas.product_category import ProductCategoryCreate, ProductCategoryUpdate
-from tests.fixtures.factories import ProductCategoryFactory
+from tests.fixtures.factories import ProductCategoryFactory, ProductFactory
 
 
 class TestProductCategoryCRUDCreate:
@@ -58,7 +61,7 @@ class TestProductCategoryCRUDCreate:
             slug="electronics-2",
         )
 
-        with pytest.raises(Exception):  # IntegrityError de SQLAlchemy
+        with pytest.raises(IntegrityError):
             crud_product_category.create(db=db, obj_in=category_in)
 
     def test_create_category_with_duplicate_slug_fails(self, db: Session):
@@ -72,9 +75,12 @@ class TestProductCategoryCRUDCreate:
             slug="electronics",
         )
 
-        with pytest.raises(Exception):  # IntegrityError de SQLAlchemy
+        with pytest.raises(IntegrityError):
             crud_product_category.create(db=db, obj_in=category_in)
 
+        # Seul le SAVEPOINT est annulé : la session reste utilisable
+        assert crud_product_category.get_by_slug(db=db, slug="electronics") is not None
+
 
 class TestProductCategoryCRUDRead:
     """Tests pour la lecture de catégories."""
@@ -118,6 +124,14 @@ class TestProductCategoryCRUDRead:
 
         assert found_category is None
 
+    def test_exists_by_slug_and_name(self, db: Session):
+        """Test de la vérification d'existence sans chargement de la ligne."""
+        ProductCategoryFactory.create(db=db, name="Electronics", slug="electronics")
+
+        assert crud_product_category.exists_by(db=db, slug="electronics") is True
+        assert crud_product_category.exists_by(db=db, name="Electronics") is True
+        assert crud_product_category.exists_by(db=db, slug="nonexistent") is False
+
     def test_get_category_by_slug(self, db: Session):
         """Test de récupération d'une catégorie par son slug."""
         # Créer une catégorie
@@ -164,7 +178,41 @@ class TestProductCategoryCRUDRead:
         # Vérifier qu'il n'y a pas de chevauchement
         first_page_ids = [cat.id for cat in first_page]
         second_page_ids = [cat.id for cat in second_page]
-        assert len(set(first_page_ids) & set(second_page_ids)) == 0
+        assert set(first_page_ids).isdisjoint(second_page_ids)
+
+    def test_get_multi_categories_with_keyset_pagination(self, db: Session):
+        """Test de pagination par curseur (created_at, id)."""
+        categories = ProductCategoryFactory.create_batch(db=db, count=7)
+
+        seen_ids = []
+        cursor = None
+        while True:
+            page, cursor = crud_product_category.get_multi_keyset(
+                db=db, cursor=cursor, limit=3
+            )
+            seen_ids.extend(cat.id for cat in page)
+            if cursor is None:
+                break
+
+        assert len(seen_ids) == 7
+        assert set(seen_ids) == {cat.id for cat in categories}
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            pytest.param("not-a-cursor", id="not_base64_json"),
+            pytest.param(
+                base64.urlsafe_b64encode(
+                    json.dumps({"ts": "2024-01-01T00:00:00", "id": 5}).encode()
+                ).decode(),
+                id="id_not_a_string",
+            ),
+        ],
+    )
+    def test_get_multi_keyset_invalid_cursor(self, db: Session, cursor: str):
+        """Test qu'un curseur malformé lève une ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            crud_product_category.get_multi_keyset(db=db, cursor=cursor)
 
     def test_get_multi_empty_database(self, db: Session):
         """Test de récupération sur une base vide."""
@@ -176,75 +224,43 @@ class TestProductCategoryCRUDRead:
 class TestProductCategoryCRUDUpdate:
     """Tests pour la mise à jour de catégories."""
 
-    def test_update_category_name(self, db: Session):
-        """Test de mise à jour du nom d'une catégorie."""
-        # Créer une catégorie
-        category = ProductCategoryFactory.create(
-            db=db, name="Electronics", slug="electronics"
-        )
+    @pytest.mark.parametrize(
+        "update_kwargs",
+        [
+            pytest.param({"name": "Electronic Devices"}, id="name"),
+            pytest.param({"slug": "electronic-devices"}, id="slug"),
+            pytest.param({"description": "New description"}, id="description"),
+            pytest.param(
+                {
+                    "name": "Electronic Devices",
+                    "slug": "electronic-devices",
+                    "description": "New description",
+                },
+                id="multiple_fields",
+            ),
+        ],
+    )
+    def test_update_category_fields(self, db: Session, update_kwargs: dict):
+        """
+        Test de mise à jour (partielle) d'une catégorie.
+        Les champs modifiés prennent la nouvelle valeur, les autres sont conservés.
+        """
+        original = {
+            "name": "Electronics",
+            "slug": "electronics",
+            "description": "Original description",
+        }
+        category = ProductCategoryFactory.create(db=db, **original)
 
-        # Mettre à jour le nom
-        category_update = ProductCategoryUpdate(name="Electronic Devices")
         updated_category = crud_product_category.update(
-            db=db, db_obj=category, obj_in=category_update
+            db=db, db_obj=category, obj_in=ProductCategoryUpdate(**update_kwargs)
         )
 
         assert updated_category.id == category.id
-        assert updated_category.name == "Electronic Devices"
-        assert updated_category.slug == "electronics"  # Le slug ne change pas
-
-    def test_update_category_slug(self, db: Session):
-        """Test de mise à jour du slug d'une catégorie."""
-        # Créer une catégorie
-        category = ProductCategoryFactory.create(
-            db=db, name="Electronics", slug="electronics"
-        )
-
-        # Mettre à jour le slug
-        category_update = ProductCategoryUpdate(slug="electronic-devices")
-        updated_category = crud_product_category.update(
-            db=db, db_obj=category, obj_in=category_update
-        )
-
-        assert updated_category.id == category.id
-        assert updated_category.name == "Electronics"  # Le nom ne change pas
-        assert updated_category.slug == "electronic-devices"
-
-    def test_update_category_description(self, db: Session):
-        """Test de mise à jour de la description d'une catégorie."""
-        # Créer une catégorie
-        category = ProductCategoryFactory.create(
-            db=db, name="Electronics", description="Old description"
-        )
-
-        # Mettre à jour la description
-        category_update = ProductCategoryUpdate(description="New description")
-        updated_category = crud_product_category.update(
-            db=db, db_obj=category, obj_in=category_update
-        )
-
-        assert updated_category.description == "New description"
-
-    def test_update_category_multiple_fields(self, db: Session):
-        """Test de mise à jour de plusieurs champs à la fois."""
-        # Créer une catégorie
-        category = ProductCategoryFactory.create(
-            db=db, name="Electronics", slug="electronics", description="Old description"
-        )
-
-        # Mettre à jour plusieurs champs
-        category_update = ProductCategoryUpdate(
-            name="Electronic Devices",
-            slug="electronic-devices",
-            description="New description",
-        )
-        updated_category = crud_product_category.update(
-            db=db, db_obj=category, obj_in=category_update
-        )
-
-        assert updated_category.name == "Electronic Devices"
-        assert updated_category.slug == "electronic-devices"
-        assert updated_category.description == "New description"
+        for field, original_value in original.items():
+            assert getattr(updated_category, field) == update_kwargs.get(
+                field, original_value
+            )
 
     def test_update_category_with_dict(self, db: Session):
         """Test de mise à jour avec un dictionnaire."""
@@ -259,27 +275,6 @@ class TestProductCategoryCRUDUpdate:
 
         assert updated_category.name == "Updated Electronics"
 
-    def test_update_category_partial(self, db: Session):
-        """Test de mise à jour partielle (seulement certains champs)."""
-        # Créer une catégorie
-        category = ProductCategoryFactory.create(
-            db=db,
-            name="Electronics",
-            slug="electronics",
-            description="Original description",
-        )
-
-        # Mettre à jour seulement le nom
-        category_update = ProductCategoryUpdate(name="Electronic Devices")
-        updated_category = crud_product_category.update(
-            db=db, db_obj=category, obj_in=category_update
-        )
-
-        # Vérifier que seul le nom a changé
-        assert updated_category.name == "Electronic Devices"
-        assert updated_category.slug == "electronics"
-        assert updated_category.description == "Original description"
-
 
 class TestProductCategoryCRUDDelete:
     """Tests pour la suppression de catégories."""
@@ -324,3 +319,15 @@ class TestProductCategoryCRUDDelete:
         # Vérifier qu'il n'en reste que 2
         remaining_categories = crud_product_category.get_multi(db=db)
         assert len(remaining_categories) == 2
+
+    def test_delete_category_with_products_raises_error(self, db: Session):
+        """Test qu'une catégorie contenant des produits ne peut pas être supprimée."""
+        category = ProductCategoryFactory.create(db=db, name="Electronics")
+        ProductFactory.create(db=db, category=category)
+
+        # category_id est NOT NULL : les produits ne peuvent pas être détachés
+        with pytest.raises(IntegrityError):
+            crud_product_category.delete(db=db, id=category.id)
+        db.rollback()
+
+        assert crud_product_category.get(db=db, id=category.id) is not None
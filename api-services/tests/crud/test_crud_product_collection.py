@@ -4,15 +4,18 @@ Teste la couche d'accès aux données sans la logique métier.
 """
 
 import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from app.crud import product_collection as crud_product_collection
+from app.models.product import ProductCollection
 from app.schemas.product_collection import (
     ProductCollectionCreate,
     ProductCollectionUpdate,
 )
-from tests.fixtures.factories import ProductCollectionFactory
+from tests.fixtures.factories import ProductCollectionFactory, ProductFactory
 
 
 class TestProductCollectionCRUDCreate:
@@ -59,7 +62,7 @@ class TestProductCollectionCRUDCreate:
             slug="summer-2024-v2",
         )
 
-        with pytest.raises(Exception):
+        with pytest.raises(IntegrityError):
             crud_product_collection.create(db=db, obj_in=collection_in)
 
     def test_create_collection_with_duplicate_slug_fails(self, db: Session):
@@ -71,43 +74,56 @@ class TestProductCollectionCRUDCreate:
             slug="summer-2024",
         )
 
-        with pytest.raises(Exception):
+        with pytest.raises(IntegrityError):
             crud_product_collection.create(db=db, obj_in=collection_in)
 
 
+@pytest.fixture(scope="class")
+def seeded_collections(db_class: Session) -> list[ProductCollection]:
+    """
+    Jeu de 10 collections créé une seule fois pour les tests de lecture.
+    À n'utiliser qu'en lecture.
+
+    Returns:
+        list[ProductCollection]: Collections commitées pour la classe
+    """
+    collections = ProductCollectionFactory.create_batch(db=db_class, count=10)
+    db_class.expunge_all()
+    return collections
+
+
+@pytest.mark.usefixtures("seeded_collections")
 class TestProductCollectionCRUDRead:
     """Tests pour la lecture de collections."""
 
-    def test_get_collection_by_id(self, db: Session):
+    def test_get_collection_by_id(self, db: Session, seeded_collections):
         """Test de récupération d'une collection par son ID."""
-        collection = ProductCollectionFactory.create(db=db, name="Summer 2024")
+        collection = seeded_collections[0]
 
         found_collection = crud_product_collection.get(db=db, id=collection.id)
 
         assert found_collection is not None
         assert found_collection.id == collection.id
-        assert found_collection.name == "Summer 2024"
+        assert found_collection.name == collection.name
 
     def test_get_collection_by_nonexistent_id_returns_none(self, db: Session):
         """Test que la récupération d'une collection inexistante retourne None."""
-        from uuid import uuid4
-
         nonexistent_id = uuid4()
         found_collection = crud_product_collection.get(db=db, id=nonexistent_id)
 
         assert found_collection is None
 
-    def test_get_collection_by_name(self, db: Session):
+    def test_get_collection_by_name(self, db: Session, seeded_collections):
         """Test de récupération d'une collection par son nom."""
-        collection = ProductCollectionFactory.create(db=db, name="Summer 2024")
+        collection = seeded_collections[1]
 
         found_collection = crud_product_collection.get_by_name(
-            db=db, name="Summer 2024"
+            db=db, name=collection.name
         )
 
         assert found_collection is not None
         assert found_collection.id == collection.id
-        assert found_collection.name == "Summer 2024"
+        assert found_collection.name == collection.name
 
     def test_get_collection_by_nonexistent_name_returns_none(self, db: Session):
         """Test que la récupération par nom inexistant retourne None."""
@@ -117,19 +133,17 @@ class TestProductCollectionCRUDRead:
 
         assert found_collection is None
 
-    def test_get_collection_by_slug(self, db: Session):
+    def test_get_collection_by_slug(self, db: Session, seeded_collections):
         """Test de récupération d'une collection par son slug."""
-        collection = ProductCollectionFactory.create(
-            db=db, name="Summer 2024", slug="summer-2024"
-        )
+        collection = seeded_collections[2]
 
         found_collection = crud_product_collection.get_by_slug(
-            db=db, slug="summer-2024"
+            db=db, slug=collection.slug
         )
 
         assert found_collection is not None
         assert found_collection.id == collection.id
-        assert found_collection.slug == "summer-2024"
+        assert found_collection.slug == collection.slug
 
     def test_get_collection_by_nonexistent_slug_returns_none(self, db: Session):
         """Test que la récupération par slug inexistant retourne None."""
@@ -139,18 +153,14 @@ class TestProductCollectionCRUDRead:
 
         assert found_collection is None
 
-    def test_get_multi_collections(self, db: Session):
+    def test_get_multi_collections(self, db: Session, seeded_collections):
         """Test de récupération de plusieurs collections."""
-        ProductCollectionFactory.create_batch(db=db, count=5)
-
         collections = crud_product_collection.get_multi(db=db, skip=0, limit=100)
 
-        assert len(collections) == 5
+        assert {col.id for col in collections} == {col.id for col in seeded_collections}
 
     def test_get_multi_collections_with_pagination(self, db: Session):
         """Test de pagination lors de la récupération de collections."""
-        ProductCollectionFactory.create_batch(db=db, count=10)
-
         first_page = crud_product_collection.get_multi(db=db, skip=0, limit=5)
         assert len(first_page) == 5
 
@@ -159,109 +169,87 @@ class TestProductCollectionCRUDRead:
 
         first_page_ids = [col.id for col in first_page]
         second_page_ids = [col.id for col in second_page]
-        assert len(set(first_page_ids) & set(second_page_ids)) == 0
+        assert set(first_page_ids).isdisjoint(second_page_ids)
 
     def test_get_multi_empty_database(self, db: Session):
         """Test de récupération sur une base vide."""
+        # Vider la table dans un SAVEPOINT : annulé avec la transaction du test
+        with db.begin_nested():
+            db.execute(delete(ProductCollection))
+
         collections = crud_product_collection.get_multi(db=db, skip=0, limit=100)
 
         assert collections == []
 
 
-class TestProductCollectionCRUDUpdate:
-    """Tests pour la mise à jour de collections."""
-
-    def test_update_collection_name(self, db: Session):
-        """Test de mise à jour du nom d'une collection."""
-        collection = ProductCollectionFactory.create(
-            db=db, name="Summer 2024", slug="summer-2024"
-        )
-
-        collection_update = ProductCollectionUpdate(name="Summer Collection 2024")
-        updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=collection_update
-        )
-
-        assert updated_collection.id == collection.id
-        assert updated_collection.name == "Summer Collection 2024"
-        assert updated_collection.slug == "summer-2024"
+# Valeurs initiales de la collection mise à jour par les tests d'update
+_ORIGINAL_COLLECTION = {
+    "name": "Summer 2024",
+    "slug": "summer-2024",
+    "description": "Original description",
+}
 
-    def test_update_collection_slug(self, db: Session):
-        """Test de mise à jour du slug d'une collection."""
-        collection = ProductCollectionFactory.create(
-            db=db, name="Summer 2024", slug="summer-2024"
-        )
 
-        collection_update = ProductCollectionUpdate(slug="summer-collection-2024")
-        updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=collection_update
-        )
+@pytest.fixture
+def fresh_collection(db: Session) -> ProductCollection:
+    """
+    Collection dans son état initial, annulée avec la transaction du test.
 
-        assert updated_collection.id == collection.id
-        assert updated_collection.name == "Summer 2024"
-        assert updated_collection.slug == "summer-collection-2024"
+    Returns:
+        ProductCollection: Collection créée avec `_ORIGINAL_COLLECTION`
+    """
+    return ProductCollectionFactory.create(db=db, **_ORIGINAL_COLLECTION)
 
-    def test_update_collection_description(self, db: Session):
-        """Test de mise à jour de la description d'une collection."""
-        collection = ProductCollectionFactory.create(
-            db=db, name="Summer 2024", description="Old description"
-        )
 
-        collection_update = ProductCollectionUpdate(description="New description")
-        updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=collection_update
-        )
-
-        assert updated_collection.description == "New description"
-
-    def test_update_collection_multiple_fields(self, db: Session):
-        """Test de mise à jour de plusieurs champs à la fois."""
-        collection = ProductCollectionFactory.create(
-            db=db, name="Summer 2024", slug="summer-2024", description="Old description"
-        )
+class TestProductCollectionCRUDUpdate:
+    """Tests pour la mise à jour de collections."""
 
-        collection_update = ProductCollectionUpdate(
-            name="Summer Sale 2024",
-            slug="summer-sale-2024",
-            description="New description",
-        )
+    @pytest.mark.parametrize(
+        "update_kwargs",
+        [
+            pytest.param({"name": "Summer Collection 2024"}, id="name"),
+            pytest.param({"slug": "summer-collection-2024"}, id="slug"),
+            pytest.param({"description": "New description"}, id="description"),
+            pytest.param(
+                {
+                    "name": "Summer Sale 2024",
+                    "slug": "summer-sale-2024",
+                    "description": "New description",
+                },
+                id="multiple_fields",
+            ),
+        ],
+    )
+    def test_update_collection_fields(
+        self, db: Session, fresh_collection: ProductCollection, update_kwargs: dict
+    ):
+        """
+        Test de mise à jour (partielle) d'une collection.
+        Les champs modifiés prennent la nouvelle valeur, les autres sont conservés.
+        """
         updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=collection_update
+            db=db,
+            db_obj=fresh_collection,
+            obj_in=ProductCollectionUpdate(**update_kwargs),
         )
 
-        assert updated_collection.name == "Summer Sale 2024"
-        assert updated_collection.slug == "summer-sale-2024"
-        assert updated_collection.description == "New description"
+        assert updated_collection.id == fresh_collection.id
+        for field, original_value in _ORIGINAL_COLLECTION.items():
+            assert getattr(updated_collection, field) == update_kwargs.get(
+                field, original_value
+            )
 
-    def test_update_collection_with_dict(self, db: Session):
+    def test_update_collection_with_dict(
+        self, db: Session, fresh_collection: ProductCollection
+    ):
         """Test de mise à jour avec un dictionnaire."""
-        collection = ProductCollectionFactory.create(db=db, name="Summer 2024")
-
         update_data = {"name": "Updated Summer 2024"}
         updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=update_data
+            db=db, db_obj=fresh_collection, obj_in=update_data
         )
 
         assert updated_collection.name == "Updated Summer 2024"
 
-    def test_update_collection_partial(self, db: Session):
-        """Test de mise à jour partielle (seulement certains champs)."""
-        collection = ProductCollectionFactory.create(
-            db=db,
-            name="Summer 2024",
-            slug="summer-2024",
-            description="Original description",
-        )
-
-        collection_update = ProductCollectionUpdate(name="Summer Sale 2024")
-        updated_collection = crud_product_collection.update(
-            db=db, db_obj=collection, obj_in=collection_update
-        )
-
-        assert updated_collection.name == "Summer Sale 2024"
-        assert updated_collection.slug == "summer-2024"
-        assert updated_collection.description == "Original description"
-
 
 class TestProductCollectionCRUDDelete:
     """Tests pour la suppression de collections."""
@@ -281,8 +269,6 @@ class TestProductCollectionCRUDDelete:
 
     def test_delete_nonexistent_collection_returns_none(self, db: Session):
         """Test que la suppression d'une collection inexistante retourne None."""
-        from uuid import uuid4
-
         nonexistent_id = uuid4()
         deleted_collection = crud_product_collection.delete(db=db, id=nonexistent_id)
 
@@ -299,3 +285,14 @@ class TestProductCollectionCRUDDelete:
 
         remaining_collections = crud_product_collection.get_multi(db=db)
         assert len(remaining_collections) == 2
+
+    def test_delete_collection_with_products_unlinks_them(self, db: Session):
+        """Test que les produits d'une collection supprimée sont conservés."""
+        collection = ProductCollectionFactory.create(db=db, name="Summer 2024")
+        products = ProductFactory.create_batch(db=db, count=2, collection=collection)
+
+        crud_product_collection.delete(db=db, id=collection.id)
+
+        for product in products:
+            db.refresh(product)
+            assert product.collection_id is None
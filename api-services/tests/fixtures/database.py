@@ -1,9 +1,8 @@
 """
 Module de configuration de la base de données pour les tests.
-Fournit une base de données SQLite en mémoire isolée pour chaque test.
+Fournit une base de données SQLite en mémoire, isolée par transaction pour chaque test.
 """
 
-from typing import Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -12,6 +11,10 @@ from app.models.base import Base
 
 # Configuration de la base de données de test (SQLite en mémoire)
 # StaticPool garde la même connexion pour éviter les problèmes avec :memory:
+# Une base :memory: est privée au processus : chaque worker pytest-xdist
+# dispose donc de sa propre base, sans URI nommée par worker.
+# StaticPool reste aussi sous xdist : un worker exécute ses tests en série, et
+# chaque nouvelle connexion :memory: ouvrirait une base vide (pas de QueuePool).
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 
 # Créer l'engine de test avec une configuration spéciale pour SQLite
@@ -20,23 +23,41 @@ test_engine = create_engine(
     connect_args={"check_same_thread": False},  # Nécessaire pour SQLite
     poolclass=StaticPool,  # Garde une seule connexion en mémoire
     echo=False,  # Pas de logs SQL pendant les tests (mettre True pour debug)
+    query_cache_size=1200,  # Cache LRU des requêtes compilées
 )
 
 
 # Activer les foreign keys pour SQLite (désactivées par défaut)
 @event.listens_for(test_engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Active les contraintes de clés étrangères pour SQLite."""
+    """
+    Active les contraintes de clés étrangères pour SQLite.
+    Supprime aussi la journalisation et les fsync, inutiles sans disque.
+    Désactive enfin la gestion implicite des transactions de pysqlite,
+    incompatible avec les SAVEPOINTs (voir `do_begin`).
+    """
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
     cursor.close()
+    dbapi_conn.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def do_begin(conn):
+    """Émet BEGIN explicitement, pysqlite ne le faisant plus lui-même."""
+    conn.exec_driver_sql("BEGIN")
 
 
 # Factory de sessions pour les tests
+# expire_on_commit=False : pas de re-SELECT des objets après chaque commit
 TestingSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=test_engine,
+    expire_on_commit=False,
 )
 
 
@@ -56,25 +77,14 @@ def drop_test_database():
     Base.metadata.drop_all(bind=test_engine)
 
 
-def get_test_db() -> Generator[Session, None, None]:
+def truncate_all(db: Session):
     """
-    Génère une session de base de données de test.
-    Utilisée pour remplacer la dépendance get_db dans les tests.
+    Supprime toutes les lignes de toutes les tables, sans DDL.
+    Les tables sont vidées dans l'ordre inverse des dépendances (clés étrangères).
 
-    Yields:
-        Session: Session de base de données de test
-    """
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def reset_test_database():
-    """
-    Réinitialise complètement la base de données de test.
-    Utile pour s'assurer d'un état propre entre les tests.
+    Args:
+        db: Session de base de données de test
     """
-    drop_test_database()
-    create_test_database()
+    for table in reversed(Base.metadata.sorted_tables):
+        db.execute(table.delete())
+    db.commit()
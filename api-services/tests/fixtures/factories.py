@@ -4,11 +4,46 @@ Simplifie la création d'objets de test avec des valeurs par défaut cohérentes
 """
 
 from typing import Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+import itertools
+import os
 import uuid
 
 from app.models.product import Product, ProductCategory, ProductCollection
 
+# Préfixe aléatoire tiré une seule fois par processus + compteur monotone
+_RUN_TAG = os.urandom(4).hex()
+_SEQ = itertools.count()
+
+
+def _unique_name(prefix: str) -> str:
+    """Génère un nom unique pour la session de test (ex: "Product-1a2b3c4d00000007")."""
+    return f"{prefix}-{_RUN_TAG}{next(_SEQ):08x}"
+
+
+# Table de traduction précalculée pour les slugs (espaces -> tirets)
+_SLUG_TRANS = str.maketrans(" ", "-")
+
+
+def _slugify(name: str) -> str:
+    """Génère un slug depuis un nom (ex: "Summer 2024" -> "summer-2024")."""
+    return name.translate(_SLUG_TRANS).lower()
+
+
+# INSERT ... RETURNING construits une seule fois pour les create_batch :
+# lignes insérées et instances ORM récupérées sans passer par le flush
+_CATEGORY_INSERT = insert(ProductCategory).returning(
+    ProductCategory, sort_by_parameter_order=True
+)
+_COLLECTION_INSERT = insert(ProductCollection).returning(
+    ProductCollection, sort_by_parameter_order=True
+)
+_PRODUCT_INSERT = insert(Product).returning(Product, sort_by_parameter_order=True)
+
+# Slug de la catégorie par défaut partagée par les produits sans catégorie
+_DEFAULT_CATEGORY_SLUG = "default-test-category"
+
 
 class ProductCategoryFactory:
     """Factory pour créer des catégories de produits de test."""
@@ -35,14 +70,14 @@ class ProductCategoryFactory:
             ProductCategory: Catégorie créée
         """
         if name is None:
-            # Générer un nom unique basé sur UUID
-            unique_id = uuid.uuid4().hex[:12]
-            name = f"Category-{unique_id}"
+            name = _unique_name("Category")
 
         if slug is None:
-            slug = name.lower().replace(" ", "-")
+            slug = _slugify(name)
 
+        # id généré côté client : connu sans flush, même si commit=False
         category = ProductCategory(
+            id=uuid.uuid4(),
             name=name,
             slug=slug,
             description=description or f"Description for {name}",
@@ -51,7 +86,6 @@ class ProductCategoryFactory:
         db.add(category)
         if commit:
             db.commit()
-            db.refresh(category)
 
         return category
 
@@ -72,23 +106,53 @@ class ProductCategoryFactory:
         Returns:
             list[ProductCategory]: Liste des catégories créées
         """
-        categories = []
-        for i in range(count):
-            unique_id = uuid.uuid4().hex[:12]
-            category = ProductCategoryFactory.create(
-                db=db,
-                name=f"Category-{unique_id}-{i}",
-                commit=False,
-            )
-            categories.append(category)
-
+        # Noms déjà uniques (compteur) : pas de suffixe d'index à ajouter
+        names = [_unique_name("Category") for _ in range(count)]
+        rows = [
+            {
+                "name": name,
+                "slug": _slugify(name),
+                "description": f"Description for {name}",
+            }
+            for name in names
+        ]
+
+        # Un seul INSERT ... RETURNING pour tout le lot
+        categories = list(db.scalars(_CATEGORY_INSERT, rows))
         if commit:
             db.commit()
-            for category in categories:
-                db.refresh(category)
 
         return categories
 
+    @staticmethod
+    def get_default(db: Session, commit: bool = True) -> ProductCategory:
+        """
+        Retourne la catégorie par défaut, créée au premier appel seulement.
+        Évite un INSERT de catégorie par produit créé sans catégorie.
+
+        Args:
+            db: Session de base de données
+            commit: Si True, commit la transaction lors de la création
+
+        Returns:
+            ProductCategory: Catégorie par défaut
+        """
+        category = (
+            db.query(ProductCategory)
+            .filter(ProductCategory.slug == _DEFAULT_CATEGORY_SLUG)
+            .first()
+        )
+        if category is None:
+            category = ProductCategoryFactory.create(
+                db=db,
+                name="Default Test Category",
+                slug=_DEFAULT_CATEGORY_SLUG,
+                commit=commit,
+            )
+            db.flush()  # Visible par la requête ci-dessus même sans commit
+
+        return category
+
 
 class ProductCollectionFactory:
     """Factory pour créer des collections de produits de test."""
@@ -115,13 +179,14 @@ class ProductCollectionFactory:
             ProductCollection: Collection créée
         """
         if name is None:
-            unique_id = uuid.uuid4().hex[:12]
-            name = f"Collection-{unique_id}"
+            name = _unique_name("Collection")
 
         if slug is None:
-            slug = name.lower().replace(" ", "-")
+            slug = _slugify(name)
 
+        # id généré côté client : connu sans flush, même si commit=False
         collection = ProductCollection(
+            id=uuid.uuid4(),
             name=name,
             slug=slug,
             description=description or f"Description for {name}",
@@ -130,7 +195,6 @@ class ProductCollectionFactory:
         db.add(collection)
         if commit:
             db.commit()
-            db.refresh(collection)
 
         return collection
 
@@ -151,20 +215,21 @@ class ProductCollectionFactory:
         Returns:
             list[ProductCollection]: Liste des collections créées
         """
-        collections = []
-        for i in range(count):
-            unique_id = uuid.uuid4().hex[:12]
-            collection = ProductCollectionFactory.create(
-                db=db,
-                name=f"Collection-{unique_id}-{i}",
-                commit=False,
-            )
-            collections.append(collection)
-
+        # Noms déjà uniques (compteur) : pas de suffixe d'index à ajouter
+        names = [_unique_name("Collection") for _ in range(count)]
+        rows = [
+            {
+                "name": name,
+                "slug": _slugify(name),
+                "description": f"Description for {name}",
+            }
+            for name in names
+        ]
+
+        # Un seul INSERT ... RETURNING pour tout le lot
+        collections = list(db.scalars(_COLLECTION_INSERT, rows))
         if commit:
             db.commit()
-            for collection in collections:
-                db.refresh(collection)
 
         return collections
 
@@ -180,6 +245,7 @@ class ProductFactory:
         category: Optional[ProductCategory] = None,
         collection: Optional[ProductCollection] = None,
         commit: bool = True,
+        slug: Optional[str] = None,
     ) -> Product:
         """
         Crée un produit de test.
@@ -188,36 +254,38 @@ class ProductFactory:
             db: Session de base de données
             name: Nom du produit (génère un nom unique si non fourni)
             description: Description du produit
-            category: Catégorie du produit (crée une nouvelle si non fournie)
+            category: Catégorie du produit (catégorie par défaut si non fournie)
             collection: Collection du produit (optionnelle)
             commit: Si True, commit la transaction
+            slug: Slug du produit (génère depuis le nom si non fourni)
 
         Returns:
             Product: Produit créé
         """
         if name is None:
-            unique_id = uuid.uuid4().hex[:12]
-            name = f"Product-{unique_id}"
+            name = _unique_name("Product")
 
-        # Créer une catégorie si non fournie
+        # Utiliser la catégorie par défaut si non fournie
         if category is None:
-            category = ProductCategoryFactory.create(db=db, commit=commit)
+            category = ProductCategoryFactory.get_default(db=db, commit=commit)
 
-        # Générer le slug depuis le nom
-        slug = name.lower().replace(" ", "-")
+        # Générer le slug depuis le nom si non fourni
+        if slug is None:
+            slug = _slugify(name)
 
+        # Relations affectées côté Python : aucun SELECT pour les relire
         product = Product(
+            id=uuid.uuid4(),
             name=name,
             slug=slug,
             description=description or f"Description for {name}",
-            category_id=category.id,
-            collection_id=collection.id if collection else None,
+            category=category,
+            collection=collection,
         )
 
         db.add(product)
         if commit:
             db.commit()
-            db.refresh(product)
 
         return product
 
@@ -228,6 +296,7 @@ class ProductFactory:
         category: Optional[ProductCategory] = None,
         collection: Optional[ProductCollection] = None,
         commit: bool = True,
+        names: Optional[list[str]] = None,
     ) -> list[Product]:
         """
         Crée plusieurs produits de test.
@@ -238,6 +307,7 @@ class ProductFactory:
             category: Catégorie commune (crée une nouvelle si non fournie)
             collection: Collection commune (optionnelle)
             commit: Si True, commit la transaction
+            names: Noms des produits (remplace `count`, slugs générés depuis les noms)
 
         Returns:
             list[Product]: Liste des produits créés
@@ -245,23 +315,26 @@ class ProductFactory:
         # Créer une catégorie commune si non fournie
         if category is None:
             category = ProductCategoryFactory.create(db=db, commit=False)
-
-        products = []
-        for i in range(count):
-            unique_id = uuid.uuid4().hex[:12]
-            product = ProductFactory.create(
-                db=db,
-                name=f"Product-{unique_id}-{i}",
-                category=category,
-                collection=collection,
-                commit=False,
-            )
-            products.append(product)
-
+            db.flush()  # La ligne référencée doit exister avant l'INSERT du lot
+
+        # Un seul INSERT ... RETURNING pour tout le lot
+        category_id = category.id
+        collection_id = collection.id if collection else None
+        if names is None:
+            names = [_unique_name("Product") for _ in range(count)]
+        rows = [
+            {
+                "name": name,
+                "slug": _slugify(name),
+                "description": f"Description for {name}",
+                "category_id": category_id,
+                "collection_id": collection_id,
+            }
+            for name in names
+        ]
+        products = list(db.scalars(_PRODUCT_INSERT, rows))
         if commit:
             db.commit()
-            for product in products:
-                db.refresh(product)
 
         return products
 
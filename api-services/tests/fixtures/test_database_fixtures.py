@@ -3,6 +3,8 @@ Tests de base pour valider l'infrastructure de test (DB, fixtures, factories).
 Ces tests s'assurent que l'environnement de test fonctionne correctement.
 """
 
+import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.product import Product, ProductCategory, ProductCollection
@@ -18,14 +20,10 @@ class TestDatabaseFixtures:
 
     def test_db_session_is_clean(self, db: Session):
         """Vérifie que la session DB est propre au début de chaque test."""
-        # La base de données devrait être vide au départ
-        categories_count = db.query(ProductCategory).count()
-        collections_count = db.query(ProductCollection).count()
-        products_count = db.query(Product).count()
-
-        assert categories_count == 0
-        assert collections_count == 0
-        assert products_count == 0
+        # La base de données devrait être vide au départ (pas de COUNT(*))
+        assert db.query(ProductCategory.id).first() is None
+        assert db.query(ProductCollection.id).first() is None
+        assert db.query(Product.id).first() is None
 
     def test_db_session_isolation(self, db: Session):
         """Vérifie que chaque test a sa propre session isolée."""
@@ -39,6 +37,37 @@ class TestDatabaseFixtures:
         assert category.id is not None
         assert db.query(ProductCategory).count() == 1
 
+    def test_db_session_rollback_keeps_previous_commits(self, db: Session):
+        """
+        Vérifie qu'un rollback du test n'annule que le dernier SAVEPOINT :
+        les données commitées plus tôt dans le test restent visibles.
+        """
+        ProductCategoryFactory.create(db=db, name="Kept", slug="kept")
+
+        with pytest.raises(IntegrityError):
+            ProductCategoryFactory.create(db=db, name="Kept", slug="kept")
+        db.rollback()
+
+        assert db.query(ProductCategory).count() == 1
+        ProductCategoryFactory.create(db=db)
+        assert db.query(ProductCategory).count() == 2
+
+
+class TestDatabaseSchema:
+    """Tests pour vérifier le schéma déclaré par les modèles."""
+
+    @pytest.mark.parametrize("model", [ProductCategory, ProductCollection])
+    @pytest.mark.parametrize("column", ["name", "slug"])
+    def test_unique_index_on_lookup_columns(self, model, column: str):
+        """Vérifie que les recherches par nom/slug disposent d'un index unique."""
+        unique_indexes = {
+            tuple(col.name for col in index.columns)
+            for index in model.__table__.indexes
+            if index.unique
+        }
+
+        assert (column,) in unique_indexes
+
 
 class TestFactories:
     """Tests pour vérifier que les factories fonctionnent correctement."""
@@ -61,10 +90,7 @@ class TestFactories:
 
     def test_category_factory_generates_unique_names(self, db: Session):
         """Vérifie que CategoryFactory génère des noms uniques automatiquement."""
-        import time
-
         category1 = ProductCategoryFactory.create(db=db)
-        time.sleep(0.001)  # Petit délai pour garantir des timestamps différents
         category2 = ProductCategoryFactory.create(db=db)
 
         assert category1.name != category2.name
@@ -151,8 +177,8 @@ class TestFactories:
         category = ProductCategoryFactory.create(db=db)
         products = ProductFactory.create_batch(db=db, count=10, category=category)
 
+        # Lignes renvoyées par l'INSERT ... RETURNING : pas besoin de recompter
         assert len(products) == 10
-        assert db.query(Product).count() == 10
 
         # Tous les produits devraient avoir la même catégorie
         assert all(p.category_id == category.id for p in products)
@@ -198,6 +224,14 @@ class TestFixturesIntegration:
         category_ids = [p.category_id for p in multiple_products]
         assert len(set(category_ids)) == 1
 
+    def test_class_fixture_usable_in_test_session(self, db: Session, test_category):
+        """Vérifie qu'un objet de fixture de classe se rattache à la session du test."""
+        category = db.merge(test_category, load=False)
+        product = ProductFactory.create(db=db, category=category)
+
+        assert product.category_id == test_category.id
+        assert product.id in {p.id for p in category.products}
+
 
 class TestDatabaseRelationships:
     """Tests pour vérifier que les relations SQLAlchemy fonctionnent."""
@@ -207,9 +241,6 @@ class TestDatabaseRelationships:
         category = ProductCategoryFactory.create(db=db, name="Books")
         product = ProductFactory.create(db=db, name="Python Guide", category=category)
 
-        # Recharger depuis la DB
-        db.refresh(product)
-
         assert product.category.name == "Books"
         assert product.category.id == category.id
 
@@ -217,12 +248,9 @@ class TestDatabaseRelationships:
         """Vérifie que la relation Category -> Products fonctionne."""
         category = ProductCategoryFactory.create(db=db, name="Electronics")
 
-        ProductFactory.create(db=db, name="Laptop", category=category)
-        ProductFactory.create(db=db, name="Mouse", category=category)
-        ProductFactory.create(db=db, name="Keyboard", category=category)
-
-        # Recharger depuis la DB
-        db.refresh(category)
+        ProductFactory.create_batch(
+            db=db, category=category, names=["Laptop", "Mouse", "Keyboard"]
+        )
 
         assert len(category.products) == 3
         product_names = [p.name for p in category.products]
@@ -241,8 +269,6 @@ class TestDatabaseRelationships:
             collection=collection,
         )
 
-        db.refresh(product)
-
         assert product.collection.name == "Best Sellers"
         assert product.collection.id == collection.id
 
@@ -251,13 +277,11 @@ class TestDatabaseRelationships:
         category = ProductCategoryFactory.create(db=db)
         collection = ProductCollectionFactory.create(db=db, name="Winter Sale")
 
-        ProductFactory.create(
-            db=db, name="Product 1", category=category, collection=collection
-        )
-        ProductFactory.create(
-            db=db, name="Product 2", category=category, collection=collection
+        ProductFactory.create_batch(
+            db=db,
+            category=category,
+            collection=collection,
+            names=["Product 1", "Product 2"],
         )
 
-        db.refresh(collection)
-
         assert len(collection.products) == 2
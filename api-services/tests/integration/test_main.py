@@ -5,12 +5,15 @@ Tests pour les routes principales de l'application.
 from fastapi import status
 
 
-def test_root_endpoint(client):
-    """Test de la route racine /"""
-    response = client.get("/")
+def _assert_ok_json(response) -> dict:
+    """Vérifie le statut 200 et retourne le corps JSON, décodé une seule fois."""
     assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
 
-    data = response.json()
+def test_root_endpoint(client_no_auth_nodb):
+    """Test de la route racine /"""
+    data = _assert_ok_json(client_no_auth_nodb.get("/"))
     assert "message" in data
     assert "version" in data
     assert "docs" in data
@@ -18,30 +21,24 @@ def test_root_endpoint(client):
     assert data["api"] == "/api/v1"
 
 
-def test_health_endpoint(client):
+def test_health_endpoint(client_no_auth_nodb):
     """Test de la route /health"""
-    response = client.get("/health")
-    assert response.status_code == status.HTTP_200_OK
-
-    data = response.json()
+    data = _assert_ok_json(client_no_auth_nodb.get("/health"))
     assert data["status"] == "healthy"
     assert "service" in data
     assert "version" in data
 
 
-def test_docs_endpoint(client):
+def test_docs_endpoint(client_no_auth_nodb):
     """Test que la documentation Swagger est accessible"""
-    response = client.get("/docs")
+    response = client_no_auth_nodb.get("/docs")
     assert response.status_code == status.HTTP_200_OK
     assert "text/html" in response.headers["content-type"]
 
 
-def test_openapi_schema(client):
+def test_openapi_schema(client_no_auth_nodb):
     """Test que le schéma OpenAPI est accessible"""
-    response = client.get("/api/v1/openapi.json")
-    assert response.status_code == status.HTTP_200_OK
-
-    data = response.json()
+    data = _assert_ok_json(client_no_auth_nodb.get("/api/v1/openapi.json"))
     assert "openapi" in data
     assert "info" in data
     assert "paths" in data
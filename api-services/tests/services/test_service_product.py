@@ -15,6 +15,14 @@ from tests.fixtures.factories import (
     ProductCollectionFactory,
 )
 
+# Clés étrangères inexistantes : (champ, message d'erreur attendu)
+_NONEXISTENT_FK_CASES = [
+    pytest.param("category_id", "Category with ID .* does not exist", id="category"),
+    pytest.param(
+        "collection_id", "Collection with ID .* does not exist", id="collection"
+    ),
+]
+
 
 class TestProductServiceGetAll:
     """Tests pour la récupération de tous les produits."""
@@ -25,19 +33,17 @@ class TestProductServiceGetAll:
 
         assert products == []
 
-    def test_get_all_products(self, db: Session):
+    def test_get_all_products(self, db: Session, shared_category):
         """Test de récupération de tous les produits."""
-        category = ProductCategoryFactory.create(db=db)
-        ProductFactory.create_batch(db=db, count=5, category=category)
+        ProductFactory.create_batch(db=db, count=5, category=shared_category)
 
         products = product_service.get_all_products(db)
 
         assert len(products) == 5
 
-    def test_get_all_products_with_pagination(self, db: Session):
+    def test_get_all_products_with_pagination(self, db: Session, shared_category):
         """Test de pagination."""
-        category = ProductCategoryFactory.create(db=db)
-        ProductFactory.create_batch(db=db, count=10, category=category)
+        ProductFactory.create_batch(db=db, count=10, category=shared_category)
 
         first_page = product_service.get_all_products(db, skip=0, limit=5)
         second_page = product_service.get_all_products(db, skip=5, limit=5)
@@ -49,9 +55,11 @@ class TestProductServiceGetAll:
 class TestProductServiceGetById:
     """Tests pour la récupération d'un produit par ID."""
 
-    def test_get_product_by_id_found(self, db: Session):
+    def test_get_product_by_id_found(self, db: Session, shared_category):
         """Test de récupération d'un produit existant."""
-        product = ProductFactory.create(db=db, name="Test Product")
+        # Rattacher la catégorie partagée à la session du test, sans SELECT
+        category = db.merge(shared_category, load=False)
+        product = ProductFactory.create(db=db, name="Test Product", category=category)
 
         found = product_service.get_product_by_id(db, product.id)
 
@@ -67,37 +75,55 @@ class TestProductServiceGetById:
         assert found is None
 
 
+@pytest.fixture(scope="class")
+def electronics_with_products(db_class: Session):
+    """
+    Catégorie "electronics" avec 10 produits, plus une autre catégorie
+    avec 2 produits, créées une seule fois par classe. À n'utiliser qu'en lecture.
+
+    Returns:
+        tuple: (catégorie "electronics", liste de ses 10 produits)
+    """
+    category = ProductCategoryFactory.create(
+        db=db_class, name="Electronics", slug="electronics"
+    )
+    products = ProductFactory.create_batch(db=db_class, count=10, category=category)
+
+    other = ProductCategoryFactory.create(db=db_class)
+    ProductFactory.create_batch(db=db_class, count=2, category=other)
+
+    db_class.expunge_all()
+    return category, products
+
+
 class TestProductServiceGetByCategory:
     """Tests pour la récupération de produits par catégorie."""
 
-    def test_get_products_by_category_id(self, db: Session):
+    def test_get_products_by_category_id(self, db: Session, electronics_with_products):
         """Test de récupération par ID de catégorie."""
-        category1 = ProductCategoryFactory.create(db=db, name="Category 1")
-        category2 = ProductCategoryFactory.create(db=db, name="Category 2")
-        ProductFactory.create_batch(db=db, count=3, category=category1)
-        ProductFactory.create_batch(db=db, count=2, category=category2)
+        category, expected = electronics_with_products
 
-        products = product_service.get_products_by_category_id(db, category1.id)
+        products = product_service.get_products_by_category_id(db, category.id)
 
-        assert len(products) == 3
-        assert all(p.category_id == category1.id for p in products)
+        assert {p.id for p in products} == {p.id for p in expected}
+        assert all(p.category_id == category.id for p in products)
 
-    def test_get_products_by_category_slug(self, db: Session):
+    def test_get_products_by_category_slug(
+        self, db: Session, electronics_with_products, no_lazy_load
+    ):
         """Test de récupération par slug de catégorie."""
-        category = ProductCategoryFactory.create(
-            db=db, name="Electronics", slug="electronics"
-        )
-        ProductFactory.create_batch(db=db, count=4, category=category)
+        _, expected = electronics_with_products
 
         products = product_service.get_products_by_category_slug(db, "electronics")
 
-        assert len(products) == 4
+        assert len(products) == len(expected)
         assert all(p.category.slug == "electronics" for p in products)
 
-    def test_get_products_by_category_with_pagination(self, db: Session):
+    def test_get_products_by_category_with_pagination(
+        self, db: Session, electronics_with_products
+    ):
         """Test de pagination par catégorie."""
-        category = ProductCategoryFactory.create(db=db)
-        ProductFactory.create_batch(db=db, count=10, category=category)
+        category, _ = electronics_with_products
 
         first_page = product_service.get_products_by_category_id(
             db, category.id, skip=0, limit=5
@@ -113,16 +139,15 @@ class TestProductServiceGetByCategory:
 class TestProductServiceGetByCollection:
     """Tests pour la récupération de produits par collection."""
 
-    def test_get_products_by_collection_id(self, db: Session):
+    def test_get_products_by_collection_id(self, db: Session, shared_category):
         """Test de récupération par ID de collection."""
-        category = ProductCategoryFactory.create(db=db)
         collection1 = ProductCollectionFactory.create(db=db, name="Collection 1")
         collection2 = ProductCollectionFactory.create(db=db, name="Collection 2")
         ProductFactory.create_batch(
-            db=db, count=3, category=category, collection=collection1
+            db=db, count=3, category=shared_category, collection=collection1
         )
         ProductFactory.create_batch(
-            db=db, count=2, category=category, collection=collection2
+            db=db, count=2, category=shared_category, collection=collection2
         )
 
         products = product_service.get_products_by_collection_id(db, collection1.id)
@@ -130,14 +155,15 @@ class TestProductServiceGetByCollection:
         assert len(products) == 3
         assert all(p.collection_id == collection1.id for p in products)
 
-    def test_get_products_by_collection_slug(self, db: Session):
+    def test_get_products_by_collection_slug(
+        self, db: Session, shared_category, no_lazy_load
+    ):
         """Test de récupération par slug de collection."""
-        category = ProductCategoryFactory.create(db=db)
         collection = ProductCollectionFactory.create(
             db=db, name="Summer Sale", slug="summer-sale"
         )
         ProductFactory.create_batch(
-            db=db, count=4, category=category, collection=collection
+            db=db, count=4, category=shared_category, collection=collection
         )
 
         products = product_service.get_products_by_collection_slug(db, "summer-sale")
@@ -147,13 +173,17 @@ class TestProductServiceGetByCollection:
 
 
 class TestProductServiceCreate:
-    """Tests pour la création de produits."""
+    """
+    Tests pour la création de produits.
+    Les schémas sont construits sans validation (`model_construct`) :
+    les données sont valides et la validation n'est pas testée ici.
+    """
 
     def test_create_product_success(self, db: Session):
         """Test de création d'un produit valide."""
         category = ProductCategoryFactory.create(db=db)
 
-        product_in = ProductCreate(
+        product_in = ProductCreate.model_construct(
             name="Laptop Dell XPS 13",
             slug="laptop-dell-xps-13",
             description="High-performance laptop",
@@ -171,7 +201,7 @@ class TestProductServiceCreate:
         category = ProductCategoryFactory.create(db=db)
         collection = ProductCollectionFactory.create(db=db)
 
-        product_in = ProductCreate(
+        product_in = ProductCreate.model_construct(
             name="Product",
             slug="product-with-collection",
             category_id=category.id,
@@ -182,93 +212,84 @@ class TestProductServiceCreate:
 
         assert product.collection_id == collection.id
 
-    def test_create_product_with_nonexistent_category_raises_error(self, db: Session):
-        """Test qu'une catégorie inexistante lève une erreur."""
-        nonexistent_id = uuid4()
-
-        product_in = ProductCreate(
-            name="Product", slug="test-product", category_id=nonexistent_id
+    @pytest.mark.parametrize("field,message", _NONEXISTENT_FK_CASES)
+    def test_create_product_with_nonexistent_fk_raises_error(
+        self, db: Session, field: str, message: str
+    ):
+        """Test qu'une catégorie ou collection inexistante lève une erreur."""
+        fk_values = {field: uuid4()}
+        # Seul le cas "collection" a besoin d'une catégorie existante
+        if field == "collection_id":
+            fk_values["category_id"] = ProductCategoryFactory.create(db=db).id
+
+        product_in = ProductCreate.model_construct(
+            name="Product", slug="test-product", **fk_values
         )
 
-        with pytest.raises(ValueError, match="Category with ID .* does not exist"):
+        with pytest.raises(ValueError, match=message):
             product_service.create_product(db, product_in)
 
-    def test_create_product_with_nonexistent_collection_raises_error(self, db: Session):
-        """Test qu'une collection inexistante lève une erreur."""
-        category = ProductCategoryFactory.create(db=db)
-        nonexistent_id = uuid4()
-
-        product_in = ProductCreate(
-            name="Product",
-            slug="test-product-collection",
-            category_id=category.id,
-            collection_id=nonexistent_id,
-        )
 
-        with pytest.raises(ValueError, match="Collection with ID .* does not exist"):
-            product_service.create_product(db, product_in)
+@pytest.fixture(scope="class")
+def old_product(db_class: Session):
+    """
+    Produit (sans collection) de départ des tests d'update, créé une seule fois
+    par classe. Les modifications faites par chaque test sont annulées avec sa
+    transaction.
+    """
+    category = ProductCategoryFactory.create(db=db_class, commit=False)
+    product = ProductFactory.create(
+        db=db_class, name="Old Name", category=category, collection=None
+    )
+    db_class.expunge_all()
+    return product
 
 
 class TestProductServiceUpdate:
-    """Tests pour la mise à jour de produits."""
+    """Tests pour la mise à jour de produits (schémas sans validation)."""
 
-    def test_update_product_name(self, db: Session):
+    def test_update_product_name(self, db: Session, old_product):
         """Test de mise à jour du nom."""
-        product = ProductFactory.create(db=db, name="Old Name")
-
-        product_in = ProductUpdate(name="New Name")
-        updated = product_service.update_product(db, product.id, product_in)
+        product_in = ProductUpdate.model_construct(name="New Name")
+        updated = product_service.update_product(db, old_product.id, product_in)
 
         assert updated.name == "New Name"
 
-    def test_update_product_category(self, db: Session):
+    def test_update_product_category(self, db: Session, old_product):
         """Test de changement de catégorie."""
-        category1 = ProductCategoryFactory.create(db=db)
         category2 = ProductCategoryFactory.create(db=db)
-        product = ProductFactory.create(db=db, category=category1)
 
-        product_in = ProductUpdate(category_id=category2.id)
-        updated = product_service.update_product(db, product.id, product_in)
+        product_in = ProductUpdate.model_construct(category_id=category2.id)
+        updated = product_service.update_product(db, old_product.id, product_in)
 
         assert updated.category_id == category2.id
 
-    def test_update_product_add_collection(self, db: Session):
+    def test_update_product_add_collection(self, db: Session, old_product):
         """Test d'ajout d'une collection."""
-        product = ProductFactory.create(db=db, collection=None)
         collection = ProductCollectionFactory.create(db=db)
 
-        product_in = ProductUpdate(collection_id=collection.id)
-        updated = product_service.update_product(db, product.id, product_in)
+        product_in = ProductUpdate.model_construct(collection_id=collection.id)
+        updated = product_service.update_product(db, old_product.id, product_in)
 
         assert updated.collection_id == collection.id
 
     def test_update_product_not_found_raises_error(self, db: Session):
         """Test qu'un produit inexistant lève une erreur."""
         nonexistent_id = uuid4()
-        product_in = ProductUpdate(name="Test")
+        product_in = ProductUpdate.model_construct(name="Test")
 
         with pytest.raises(ValueError, match="Product with ID .* not found"):
             product_service.update_product(db, nonexistent_id, product_in)
 
-    def test_update_product_with_nonexistent_category_raises_error(self, db: Session):
-        """Test qu'une catégorie inexistante lève une erreur."""
-        product = ProductFactory.create(db=db)
-        nonexistent_id = uuid4()
-
-        product_in = ProductUpdate(category_id=nonexistent_id)
-
-        with pytest.raises(ValueError, match="Category with ID .* does not exist"):
-            product_service.update_product(db, product.id, product_in)
-
-    def test_update_product_with_nonexistent_collection_raises_error(self, db: Session):
-        """Test qu'une collection inexistante lève une erreur."""
-        product = ProductFactory.create(db=db)
-        nonexistent_id = uuid4()
-
-        product_in = ProductUpdate(collection_id=nonexistent_id)
+    @pytest.mark.parametrize("field,message", _NONEXISTENT_FK_CASES)
+    def test_update_product_with_nonexistent_fk_raises_error(
+        self, db: Session, old_product, field: str, message: str
+    ):
+        """Test qu'une catégorie ou collection inexistante lève une erreur."""
+        product_in = ProductUpdate.model_construct(**{field: uuid4()})
 
-        with pytest.raises(ValueError, match="Collection with ID .* does not exist"):
-            product_service.update_product(db, product.id, product_in)
+        with pytest.raises(ValueError, match=message):
+            product_service.update_product(db, old_product.id, product_in)
 
 
 class TestProductServiceDelete:
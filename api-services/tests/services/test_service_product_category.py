@@ -40,7 +40,7 @@ class TestProductCategoryServiceGetAll:
 
         first_ids = [c.id for c in first_page]
         second_ids = [c.id for c in second_page]
-        assert len(set(first_ids) & set(second_ids)) == 0
+        assert set(first_ids).isdisjoint(second_ids)
 
 
 class TestProductCategoryServiceGetBySlug:
@@ -113,35 +113,43 @@ class TestProductCategoryServiceCreate:
         assert category.description is None
 
 
+@pytest.fixture(scope="class")
+def seed_categories(db_class: Session):
+    """
+    Catégories de départ des tests d'update, créées une seule fois par classe.
+    Les modifications faites par chaque test sont annulées avec sa transaction.
+    """
+    ProductCategoryFactory.create(
+        db=db_class, name="Existing Name", slug="existing-slug", commit=False
+    )
+    ProductCategoryFactory.create(db=db_class, name="My Name", slug="my-slug")
+    db_class.expunge_all()
+
+
+@pytest.mark.usefixtures("seed_categories")
 class TestProductCategoryServiceUpdate:
-    """Tests pour la mise à jour de catégories."""
+    """Tests pour la mise à jour de catégories ("my-slug" / "existing-slug")."""
 
     def test_update_category_name(self, db: Session):
         """Test de mise à jour du nom."""
-        ProductCategoryFactory.create(db=db, name="Old Name", slug="old-name")
-
         category_in = ProductCategoryUpdate(name="New Name")
-        updated = product_category_service.update_category(db, "old-name", category_in)
+        updated = product_category_service.update_category(db, "my-slug", category_in)
 
         assert updated.name == "New Name"
-        assert updated.slug == "old-name"
+        assert updated.slug == "my-slug"
 
     def test_update_category_slug(self, db: Session):
         """Test de mise à jour du slug."""
-        ProductCategoryFactory.create(db=db, name="Category", slug="old-slug")
-
         category_in = ProductCategoryUpdate(slug="new-slug")
-        updated = product_category_service.update_category(db, "old-slug", category_in)
+        updated = product_category_service.update_category(db, "my-slug", category_in)
 
         assert updated.slug == "new-slug"
-        assert updated.name == "Category"
+        assert updated.name == "My Name"
 
     def test_update_category_description(self, db: Session):
         """Test de mise à jour de la description."""
-        ProductCategoryFactory.create(db=db, slug="test")
-
         category_in = ProductCategoryUpdate(description="New description")
-        updated = product_category_service.update_category(db, "test", category_in)
+        updated = product_category_service.update_category(db, "my-slug", category_in)
 
         assert updated.description == "New description"
 
@@ -156,9 +164,6 @@ class TestProductCategoryServiceUpdate:
 
     def test_update_category_duplicate_slug_raises_error(self, db: Session):
         """Test qu'un slug dupliqué lors de l'update lève une erreur."""
-        ProductCategoryFactory.create(db=db, slug="existing-slug")
-        ProductCategoryFactory.create(db=db, slug="my-slug")
-
         category_in = ProductCategoryUpdate(slug="existing-slug")
 
         with pytest.raises(ValueError, match="slug 'existing-slug' already exists"):
@@ -166,9 +171,6 @@ class TestProductCategoryServiceUpdate:
 
     def test_update_category_duplicate_name_raises_error(self, db: Session):
         """Test qu'un nom dupliqué lors de l'update lève une erreur."""
-        ProductCategoryFactory.create(db=db, name="Existing Name", slug="existing")
-        ProductCategoryFactory.create(db=db, name="My Name", slug="my-slug")
-
         category_in = ProductCategoryUpdate(name="Existing Name")
 
         with pytest.raises(ValueError, match="name 'Existing Name' already exists"):
@@ -176,8 +178,6 @@ class TestProductCategoryServiceUpdate:
 
     def test_update_category_same_slug_allowed(self, db: Session):
         """Test qu'on peut garder le même slug lors de l'update."""
-        ProductCategoryFactory.create(db=db, name="Old", slug="my-slug")
-
         category_in = ProductCategoryUpdate(name="New", slug="my-slug")
         updated = product_category_service.update_category(db, "my-slug", category_in)
 
@@ -186,10 +186,8 @@ class TestProductCategoryServiceUpdate:
 
     def test_update_category_same_name_allowed(self, db: Session):
         """Test qu'on peut garder le même nom lors de l'update."""
-        ProductCategoryFactory.create(db=db, name="My Name", slug="old")
-
         category_in = ProductCategoryUpdate(name="My Name", slug="new")
-        updated = product_category_service.update_category(db, "old", category_in)
+        updated = product_category_service.update_category(db, "my-slug", category_in)
 
         assert updated.name == "My Name"
         assert updated.slug == "new"
@@ -45,7 +45,7 @@ class TestProductCollectionServiceGetAll:
 
         first_ids = [c.id for c in first_page]
         second_ids = [c.id for c in second_page]
-        assert len(set(first_ids) & set(second_ids)) == 0
+        assert set(first_ids).isdisjoint(second_ids)
 
 
 class TestProductCollectionServiceGetBySlug:
@@ -118,40 +118,48 @@ class TestProductCollectionServiceCreate:
         assert collection.description is None
 
 
+@pytest.fixture(scope="class")
+def seed_collections(db_class: Session):
+    """
+    Collections de départ des tests d'update, créées une seule fois par classe.
+    Les modifications faites par chaque test sont annulées avec sa transaction.
+    """
+    ProductCollectionFactory.create(
+        db=db_class, name="Existing Name", slug="existing-slug", commit=False
+    )
+    ProductCollectionFactory.create(db=db_class, name="My Name", slug="my-slug")
+    db_class.expunge_all()
+
+
+@pytest.mark.usefixtures("seed_collections")
 class TestProductCollectionServiceUpdate:
-    """Tests pour la mise à jour de collections."""
+    """Tests pour la mise à jour de collections ("my-slug" / "existing-slug")."""
 
     def test_update_collection_name(self, db: Session):
         """Test de mise à jour du nom."""
-        ProductCollectionFactory.create(db=db, name="Old Name", slug="old-name")
-
         collection_in = ProductCollectionUpdate(name="New Name")
         updated = product_collection_service.update_collection(
-            db, "old-name", collection_in
+            db, "my-slug", collection_in
         )
 
         assert updated.name == "New Name"
-        assert updated.slug == "old-name"
+        assert updated.slug == "my-slug"
 
     def test_update_collection_slug(self, db: Session):
         """Test de mise à jour du slug."""
-        ProductCollectionFactory.create(db=db, name="Collection", slug="old-slug")
-
         collection_in = ProductCollectionUpdate(slug="new-slug")
         updated = product_collection_service.update_collection(
-            db, "old-slug", collection_in
+            db, "my-slug", collection_in
         )
 
         assert updated.slug == "new-slug"
-        assert updated.name == "Collection"
+        assert updated.name == "My Name"
 
     def test_update_collection_description(self, db: Session):
         """Test de mise à jour de la description."""
-        ProductCollectionFactory.create(db=db, slug="test")
-
         collection_in = ProductCollectionUpdate(description="New description")
         updated = product_collection_service.update_collection(
-            db, "test", collection_in
+            db, "my-slug", collection_in
         )
 
         assert updated.description == "New description"
@@ -169,9 +177,6 @@ class TestProductCollectionServiceUpdate:
 
     def test_update_collection_duplicate_slug_raises_error(self, db: Session):
         """Test qu'un slug dupliqué lors de l'update lève une erreur."""
-        ProductCollectionFactory.create(db=db, slug="existing-slug")
-        ProductCollectionFactory.create(db=db, slug="my-slug")
-
         collection_in = ProductCollectionUpdate(slug="existing-slug")
 
         with pytest.raises(ValueError, match="slug 'existing-slug' already exists"):
@@ -179,9 +184,6 @@ class TestProductCollectionServiceUpdate:
 
     def test_update_collection_duplicate_name_raises_error(self, db: Session):
         """Test qu'un nom dupliqué lors de l'update lève une erreur."""
-        ProductCollectionFactory.create(db=db, name="Existing Name", slug="existing")
-        ProductCollectionFactory.create(db=db, name="My Name", slug="my-slug")
-
         collection_in = ProductCollectionUpdate(name="Existing Name")
 
         with pytest.raises(ValueError, match="name 'Existing Name' already exists"):
@@ -189,8 +191,6 @@ class TestProductCollectionServiceUpdate:
 
     def test_update_collection_same_slug_allowed(self, db: Session):
         """Test qu'on peut garder le même slug lors de l'update."""
-        ProductCollectionFactory.create(db=db, name="Old", slug="my-slug")
-
         collection_in = ProductCollectionUpdate(name="New", slug="my-slug")
         updated = product_collection_service.update_collection(
             db, "my-slug", collection_in
@@ -201,10 +201,10 @@ class TestProductCollectionServiceUpdate:
 
     def test_update_collection_same_name_allowed(self, db: Session):
         """Test qu'on peut garder le même nom lors de l'update."""
-        ProductCollectionFactory.create(db=db, name="My Name", slug="old")
-
         collection_in = ProductCollectionUpdate(name="My Name", slug="new")
-        updated = product_collection_service.update_collection(db, "old", collection_in)
+        updated = product_collection_service.update_collection(
+            db, "my-slug", collection_in
+        )
 
         assert updated.name == "My Name"
         assert updated.slug == "new"